@@ -1,45 +1,156 @@
 # /config/custom_components/mitrastar_n1/__init__.py
 
+import asyncio
+import contextlib
+import hashlib
 import logging
+import time
 from datetime import timedelta
+from typing import NamedTuple
 import re
-import requests
-import hashlib
-import socket
 
 # Home Assistant imports: guard so tests can run without Home Assistant installed
 try:
-    from homeassistant.core import HomeAssistant
+    from homeassistant.core import HomeAssistant, callback
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.const import CONF_HOST, CONF_USERNAME, CONF_PASSWORD
     from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
     from homeassistant.exceptions import ConfigEntryNotReady, ConfigEntryAuthFailed
+    from homeassistant.helpers.storage import Store
+    from homeassistant.helpers.event import async_track_time_interval
     _HAS_HA = True
 except Exception:  # pragma: no cover - fallback for test environments
     # Define lightweight fallbacks so module can be imported in CI/local tests
     HomeAssistant = object
+
+    def callback(func):
+        return func
+
     ConfigEntry = object
     CONF_HOST = "host"
     CONF_USERNAME = "username"
     CONF_PASSWORD = "password"
-    DataUpdateCoordinator = object
-    UpdateFailed = Exception
-    ConfigEntryNotReady = Exception
-    ConfigEntryAuthFailed = Exception
+    class DataUpdateCoordinator:
+        """Substituto mínimo do coordinator do HA, para testes e scripts sem o HA."""
+
+        def __init__(self, hass, logger, *, name, update_interval=None, always_update=True, **kwargs):
+            self.hass = hass
+            self.logger = logger
+            self.name = name
+            self.update_interval = update_interval
+            self.data = None
+            self.last_update_success = True
+            self.last_exception = None
+            self._listeners = {}
+
+        async def async_refresh(self):
+            try:
+                self.data = await self._async_update_data()
+                self.last_update_success = True
+            except Exception as err:
+                self.last_exception = err
+                self.last_update_success = False
+            self.async_update_listeners()
+
+        def async_add_listener(self, update_callback, context=None):
+            self._listeners[update_callback] = context
+            return lambda: self._listeners.pop(update_callback, None)
+
+        def async_update_listeners(self):
+            for update_callback in list(self._listeners):
+                update_callback()
+
+        def async_contexts(self):
+            return (context for context in self._listeners.values() if context is not None)
+
+    # Classes distintas: o coordinator trata falha de autenticação de forma diferente
+    class UpdateFailed(Exception):
+        pass
+
+    class ConfigEntryNotReady(Exception):
+        pass
+
+    class ConfigEntryAuthFailed(Exception):
+        pass
+
+    Store = None
+    async_track_time_interval = None
     _HAS_HA = False
 
-from .const import DOMAIN
+from .const import DOMAIN, FLEET, PENDING_SESSIONS
 from . import parsers
+from .clients import EMPTY_DIFF, build_devices
+from .api import DeadlineExceeded, MitraStarClient, MitraStarError, SessionExpired
+from .snapshot import decode_snapshot, encode_snapshot
+from .stats import RefreshStats
+from .fleet import FleetScheduler
+from .health import HALF_OPEN, ModemHealth
 
 _LOGGER = logging.getLogger(__name__)
 
 # Plataformas suportadas
 PLATFORMS = ["binary_sensor", "sensor"]
 
+
+class PageSpec(NamedTuple):
+    """Página do modem, o método que a interpreta e sua cadência de atualização."""
+    path: str
+    parser: str
+    interval: timedelta
+    raw: bool = False
+    optional: bool = False
+    # Campos (parsers.*_FIELDS) que bastam: a leitura para assim que todos chegarem
+    fields: dict = None
+
+
+# Páginas buscadas, indexadas pela seção de coordinator.data que cada uma alimenta.
+# Cada página tem seu próprio intervalo: a lista DHCP (presença) muda a todo momento,
+# as configurações de Wi-Fi raramente e os dados do aparelho praticamente nunca.
+PAGES = {
+    # about-power-box2.cgi tem cabeçalhos malformados -> leitura tolerante
+    "device_info": PageSpec("/cgi-bin/about-power-box2.cgi", "_parse_device_info", timedelta(hours=1), raw=True,
+                            fields=parsers.DEVICE_INFO_FIELDS),
+    "devices": PageSpec("/cgi-bin/dhcp_client_list.cgi", "_parse_device_table", timedelta(seconds=15)),
+    "wifi_24ghz": PageSpec("/cgi-bin/settings-wireless-network.cgi", "_parse_wifi_24ghz", timedelta(minutes=10)),
+    "wifi_5ghz": PageSpec("/cgi-bin/settings-wireless-network-5g.cgi", "_parse_wifi_5ghz", timedelta(minutes=10), optional=True),
+    # settings-local-network.cgi tem ~2.800 linhas, mas só o MAC interessa
+    "modem_mac": PageSpec("/cgi-bin/settings-local-network.cgi", "_parse_modem_mac", timedelta(hours=1),
+                          fields=parsers.MODEM_MAC_FIELDS),
+    # Status de GPON/Internet/TV/telefone: indexado por seção e interpretado só
+    # quando alguma entidade lê a seção (parsers.SophiaInfo)
+    "connectivity_info": PageSpec("/cgi-bin/sophia_info.cgi", "_parse_connectivity_info", timedelta(minutes=1),
+                                  optional=True),
+}
+
 # Configurações gerais
-SCAN_INTERVAL = timedelta(seconds=60)
+# O coordinator acorda no ritmo da página mais frequente e busca só as que venceram
+SCAN_INTERVAL = min(spec.interval for spec in PAGES.values())
+# Laço de presença: só a lista DHCP, num ritmo mais curto que o das demais páginas.
+# Enquanto ele roda, o ciclo principal deixa de buscar essa página.
+PRESENCE_INTERVAL = timedelta(seconds=5)
+# Folga para considerar uma página vencida mesmo se o timer disparar um pouco antes
+SCHEDULE_TOLERANCE = 1.0
 REQUEST_TIMEOUT = 30
-BROWSER_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:145.0) Gecko/20100101 Firefox/145.0"
+# Prazo total de um ciclo (login + páginas, incluindo um novo login após sessão
+# expirada). Esgotado, o que estiver pendente é cancelado: páginas opcionais ficam
+# sem dados, as obrigatórias fazem o ciclo falhar. O login usa no máximo LOGIN_BUDGET.
+CYCLE_BUDGET = 45
+LOGIN_BUDGET = 15
+# Sessão ociosa há mais que isso (s): a primeira página do ciclo vai sozinha e serve de sonda
+SESSION_PROBE_IDLE = 120
+# Máximo de páginas buscadas simultaneamente no modem (1 = busca sequencial)
+MAX_CONCURRENT_REQUESTS = 3
+# Reaproveita conexões HTTP/1.1 (keep-alive) entre as páginas e os ciclos
+KEEP_ALIVE = True
+# Snapshot em disco dos últimos dados bons (partida a quente após reiniciar o HA)
+SNAPSHOT_STORAGE_VERSION = 1
+# Intervalo mínimo entre gravações do snapshot e atraso de cada gravação (s)
+SNAPSHOT_SAVE_INTERVAL = 300
+SNAPSHOT_SAVE_DELAY = 10
+
+def _snapshot_store(hass, entry):
+    """Store do HA onde fica o snapshot desta entrada."""
+    return Store(hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Configura a integração a partir de uma entrada de configuração."""
@@ -47,253 +158,509 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     username = entry.data[CONF_USERNAME]
     password = entry.data[CONF_PASSWORD]
 
-    coordinator = MitraStarCoordinator(hass, host, username, password)
-
-    await coordinator.async_config_entry_first_refresh()
-
-    if not coordinator.last_update_success:
-        raise ConfigEntryNotReady(
-            f"Falha na primeira atualização de dados: {coordinator.last_exception}"
-        )
+    # Um único agendador para todos os modems: escalona os ciclos e limita as
+    # requisições simultâneas somando todas as entradas
+    fleet = hass.data.get(FLEET)
+    if fleet is None:
+        fleet = hass.data[FLEET] = FleetScheduler()
+    coordinator = MitraStarCoordinator(hass, host, username, password, fleet=fleet)
+    # Reaproveita a sessão validada pelo config flow (ou deixada por um reload recente)
+    session = hass.data.get(PENDING_SESSIONS, {}).pop(host, None)
+    if coordinator.client.adopt_session(session):
+        _LOGGER.debug("Reaproveitando sessão recente com o modem %s.", host)
+
+    coordinator.snapshot_store = _snapshot_store(hass, entry)
+    # Com um snapshot recente, as entidades nascem dele e a atualização real roda em
+    # segundo plano; sem snapshot, a primeira atualização continua bloqueando o setup
+    restored = coordinator.restore_snapshot(await coordinator.snapshot_store.async_load())
+    if not restored:
+        await coordinator.async_config_entry_first_refresh()
+
+        if not coordinator.last_update_success:
+            raise ConfigEntryNotReady(
+                f"Falha na primeira atualização de dados: {coordinator.last_exception}"
+            )
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if restored:
+        _LOGGER.debug("Entidades restauradas do snapshot; atualizando em segundo plano.")
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} warm start refresh"
+        )
+
+    entry.async_on_unload(
+        fleet.add(coordinator.fleet_key, coordinator.async_fleet_refresh, coordinator.poll_interval.total_seconds())
+    )
+    entry.async_on_unload(coordinator.async_start_presence_loop(PRESENCE_INTERVAL))
+
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Descarrega a entrada de configuração."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        # Num reload, a próxima configuração adota a sessão em vez de logar de novo
+        session = coordinator.client.export_session()
+        if session:
+            hass.data.setdefault(PENDING_SESSIONS, {})[coordinator.host] = session
+        await coordinator.client.async_close()
     return unload_ok
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Apaga o snapshot em disco quando a entrada é removida."""
+    await _snapshot_store(hass, entry).async_remove()
+
+async def _async_within(deadline, awaitable, what):
+    """Aguarda ``awaitable`` até ``deadline`` (time.monotonic); depois disso, cancela.
+
+    Levanta DeadlineExceeded se o prazo acabar, ou se já tiver acabado antes de começar.
+    """
+    if deadline is None:
+        return await awaitable
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        awaitable.close()
+        raise DeadlineExceeded(f"Prazo do ciclo esgotado antes de {what}")
+    try:
+        return await asyncio.wait_for(awaitable, remaining)
+    except asyncio.TimeoutError as err:
+        raise DeadlineExceeded(f"Prazo do ciclo esgotado durante {what}") from err
+
+def _page_digest(html):
+    """Digest curto do conteúdo de uma página (bytes crus ou str), para detectar mudanças."""
+    if isinstance(html, str):
+        html = html.encode("iso-8859-1", errors="ignore")
+    return hashlib.blake2b(html, digest_size=16).digest()
+
+
 class MitraStarCoordinator(DataUpdateCoordinator):
     """Gerencia a busca de dados do modem MitraStar."""
 
-    def __init__(self, hass, host, username, password):
-        """Inicializa o coordinator."""
+    def __init__(self, hass, host, username, password,
+                 max_concurrent_requests=MAX_CONCURRENT_REQUESTS, keep_alive=KEEP_ALIVE, fleet=None):
+        """Inicializa o coordinator.
+
+        Com ``fleet`` (FleetScheduler), o coordinator não tem timer próprio: os
+        ciclos são disparados pela frota, que também limita as requisições
+        simultâneas somando todos os modems.
+        """
         self.host = host
         self.username = username
         self.password = password
         self._base_url = f"http://{host}"
+
+        # Limita quantas páginas são buscadas ao mesmo tempo (o modem tem CPU fraca)
+        self._request_semaphore = asyncio.Semaphore(max(1, max_concurrent_requests))
         
-        # Sessão persistente
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": BROWSER_USER_AGENT})
-        
+        # Sessão persistente (transporte asyncio nativo, sem threads do executor).
+        # Mantém no máximo uma conexão keep-alive por requisição simultânea.
+        self.client = MitraStarClient(
+            host, username, password, timeout=REQUEST_TIMEOUT,
+            keep_alive=keep_alive, max_connections=max_concurrent_requests,
+        )
+
+        # Próximo instante (time.monotonic) em que cada página deve ser buscada
+        self._next_fetch = {key: 0.0 for key in PAGES}
+        # Digest do último conteúdo interpretado de cada página
+        self._digests = {}
+        # Clientes DHCP adicionados/removidos/alterados no último ciclo
+        self.devices_diff = EMPTY_DIFF
+        # Snapshot em disco (Store do HA), definido no setup
+        self.snapshot_store = None
+        self._next_snapshot_save = 0.0
+        # Tempos de login/busca/parsing e falhas dos ciclos recentes (diagnóstico)
+        self.stats = RefreshStats()
+        # Latência e erros das requisições: estica o intervalo ou abre o disjuntor
+        # quando o modem está sobrecarregado, para não piorar a situação
+        self.health = ModemHealth()
+        # Agendamento: próprio (update_interval) ou pela frota (fleet_key)
+        self.fleet = fleet
+        self.fleet_key = host
+        self.poll_interval = SCAN_INTERVAL
+        self._base_poll_interval = SCAN_INTERVAL
+        # Laço de presença (lista DHCP em ritmo próprio); ver async_start_presence_loop
+        self._presence_active = False
+        self._presence_ticks = 0
+        self._presence_lock = asyncio.Lock()
+        # Se o último ciclo chegou a consultar o modem (contagem de polls da frota)
+        self._polled = False
+        # Um login por vez: o laço de presença e o ciclo principal compartilham a sessão
+        self._session_lock = asyncio.Lock()
+
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=SCAN_INTERVAL,
+            update_interval=None if fleet is not None else SCAN_INTERVAL,
+            # Seções inalteradas são reaproveitadas, então dados iguais não notificam ninguém
+            always_update=False,
         )
 
-    def _blocking_login(self):
-        """Realiza o login no modem (executado no executor)."""
-        login_url = f"{self._base_url}/cgi-bin/login.cgi"
-        post_headers = {'Referer': login_url}
+    async def _async_fetch_page(self, key, deadline=None):
+        """Busca a página ``key`` respeitando o limite de requisições simultâneas.
 
-        try:
-            # 1. Obter a página de login para pegar o 'sid' (salt)
-            get_response = self.session.get(login_url, timeout=REQUEST_TIMEOUT)
-            get_response.raise_for_status()
-            initial_html = get_response.content.decode("iso-8859-1", errors="ignore")
-
-            sid_match = re.search(r"var sid = '([a-f0-9]+)';", initial_html)
-            if not sid_match:
-                _LOGGER.error("Não foi possível encontrar o SID na página de login.")
-                return False
-            sid = sid_match.group(1)
-
-            # 2. Calcular o hash da senha (senha:sid)
-            challenge_string = f"{self.password}:{sid}"
-            hashed_password = hashlib.md5(challenge_string.encode('utf-8')).hexdigest()
-
-            # 3. Enviar POST de login
-            login_payload = {
-                'Loginuser': self.username,
-                'LoginPasswordValue': hashed_password,
-                'acceptLoginIndex': '1'
-            }
-            
-            post_response = self.session.post(
-                login_url, 
-                data=login_payload, 
-                headers=post_headers, 
-                timeout=REQUEST_TIMEOUT
-            )
-            post_response_text = post_response.content.decode("iso-8859-1", errors="ignore")
-            
-            # Verifica sucesso (se redirecionou ou setou cookie)
-            if "login" in post_response_text.lower() or not self.session.cookies:
-                _LOGGER.error("Falha no login: Credenciais inválidas ou erro no processamento.")
-                return False
-
-            _LOGGER.info("Autenticação bem-sucedida com o modem.")
-            return True
-
-        except requests.exceptions.RequestException as err:
-            _LOGGER.error("Erro de conexão durante o login: %s", err)
-            return False
+        Com ``deadline`` (time.monotonic), a busca é cancelada quando o prazo do
+        ciclo acaba, inclusive se ele acabou enquanto a página aguardava a vez.
 
-    def _fetch_raw_socket(self, path):
+        Páginas com ``fields`` são lidas em streaming e devolvem só o trecho
+        inicial que contém todos os campos; o parser dá o mesmo resultado nele.
+        O conteúdo volta como bytes crus: os parsers trabalham direto neles e só
+        decodificam os valores capturados.
         """
-        Busca a URL usando sockets puros para contornar o erro de cabeçalho malformado do modem.
-        Ignora completamente a validação HTTP do urllib3/requests.
+        spec = PAGES[key]
+        async with contextlib.AsyncExitStack() as slots:
+            started = None
+            try:
+                # A espera pela vez (semáforo local e limite da frota) também gasta o prazo
+                for slot in (self._request_semaphore, self._fleet_slot()):
+                    await _async_within(deadline, slots.enter_async_context(slot), f"a vez de {spec.path}")
+                started = time.monotonic()
+                page = await _async_within(deadline, self._async_download(spec), spec.path)
+            except MitraStarError as e:
+                self.stats.record_failure(f"{key}: {type(e).__name__}")
+                # Sessão expirada, ou página que nem chegou a ser pedida, não dizem
+                # nada sobre a saúde do modem
+                sent = started is not None and (deadline is None or started < deadline)
+                if sent and not isinstance(e, SessionExpired):
+                    self.health.record_error()
+                if isinstance(e, SessionExpired) or not spec.raw:
+                    raise
+                _LOGGER.error("Erro na leitura tolerante de %s: %s", spec.path, e)
+                return None
+            elapsed = time.monotonic() - started
+            self.health.record_response(elapsed)
+            self.stats.record_fetch(key, elapsed, len(page))
+            return page
+
+    def _fleet_slot(self):
+        """Vaga no limite global de requisições da frota (ou nenhum limite extra)."""
+        if self.fleet is None:
+            return contextlib.nullcontext()
+        return self.fleet.request_slot()
+
+    async def _async_download(self, spec):
+        """Baixa a página ``spec`` pelo caminho adequado (normal, tolerante ou streaming)."""
+        path = spec.path
+        if spec.fields is not None:
+            _LOGGER.debug("Buscando %s até obter os campos necessários...", path)
+            extractor = parsers.StreamExtractor(spec.fields)
+            await self.client.async_fetch_fields(path, extractor, lenient=spec.raw)
+            return extractor.buffer
+        if spec.raw:
+            _LOGGER.debug("Buscando %s via leitura tolerante...", path)
+            return await self.client.async_fetch_raw(path, decode=False)
+        _LOGGER.debug("Buscando %s...", path)
+        return await self.client.async_fetch(path, decode=False)
+
+    def restore_snapshot(self, payload):
+        """Restaura coordinator.data a partir de um snapshot salvo.
+
+        Retorna True se havia um snapshot válido. Todas as páginas continuam
+        vencidas, então a próxima atualização reconcilia tudo com o modem.
         """
+        decoded = decode_snapshot(payload)
+        if decoded is None:
+            return False
+        sections, device_rows = decoded
+        data = {key: value for key, value in sections.items() if key in PAGES}
+        data["devices"], _ = build_devices(device_rows)
+        self.data = data
+        return True
+
+    def _schedule_snapshot_save(self):
+        """Agenda a gravação do snapshot, no máximo uma vez por SNAPSHOT_SAVE_INTERVAL."""
+        now = time.monotonic()
+        if self.snapshot_store is None or now < self._next_snapshot_save:
+            return
+        self._next_snapshot_save = now + SNAPSHOT_SAVE_INTERVAL
+        # O Store chama a função na hora de gravar, com os dados mais recentes
+        self.snapshot_store.async_delay_save(lambda: encode_snapshot(self.data), SNAPSHOT_SAVE_DELAY)
+
+    async def _async_ensure_session(self, deadline=None):
+        """Faz login apenas se não houver sessão válida (em até LOGIN_BUDGET do prazo).
+
+        O login acontece sob ``_session_lock``: quem chega enquanto outro caminho
+        está logando espera e reaproveita a sessão nova em vez de logar de novo.
+        """
+        if self.client.has_session:
+            return
+        login_deadline = time.monotonic() + LOGIN_BUDGET
+        if deadline is not None:
+            login_deadline = min(login_deadline, deadline)
+        await _async_within(login_deadline, self._session_lock.acquire(), "o login")
+        try:
+            if not self.client.has_session:
+                await self._async_login(login_deadline)
+        finally:
+            self._session_lock.release()
+
+    async def _async_login(self, login_deadline):
+        relogin = self.client.login_count > 0
+        started = time.monotonic()
         try:
-            _LOGGER.debug("Iniciando Raw Socket para: %s", path)
-            
-            # Prepara os cookies da sessão atual para enviar no socket
-            cookies_str = "; ".join([f"{c.name}={c.value}" for c in self.session.cookies])
-            
-            # Monta a requisição HTTP manualmente
-            request_data = (
-                f"GET {path} HTTP/1.1\r\n"
-                f"Host: {self.host}\r\n"
-                f"User-Agent: {BROWSER_USER_AGENT}\r\n"
-                f"Connection: close\r\n"
-                f"Referer: {self._base_url}/cgi-bin/sophia_index.cgi\r\n"
+            logged_in = await _async_within(login_deadline, self.client.async_login(), "o login")
+        except DeadlineExceeded:
+            self.stats.record_failure("login")
+            self.health.record_error()
+            raise
+        if not logged_in:
+            self.stats.record_failure("login")
+            self.health.record_error()
+            raise ConfigEntryAuthFailed("Falha na re-autenticação com o modem.")
+        elapsed = time.monotonic() - started
+        self.health.record_response(elapsed)
+        self.stats.record_login(elapsed, relogin=relogin)
+
+    def _invalidate_session(self, session):
+        """Descarta a sessão que falhou (``session`` = seu session_started), se ainda for a atual.
+
+        Se outro caminho já está logando, ou já logou, a sessão nova é mantida.
+        """
+        if self._session_lock.locked() or self.client.session_started != session:
+            return
+        self.client.invalidate_session()
+
+    async def _async_fetch_pages(self, keys, deadline=None):
+        """Busca as páginas ``keys`` em paralelo; exceções voltam como resultado.
+
+        Se a sessão está ociosa há mais de SESSION_PROBE_IDLE, a página mais leve
+        vai sozinha primeiro e serve de sonda: se a sessão expirou, só ela é
+        desperdiçada antes do novo login.
+        """
+        idle = self.client.session_idle
+        if len(keys) > 1 and idle is not None and idle > SESSION_PROBE_IDLE:
+            probe = "devices" if "devices" in keys else keys[0]
+            try:
+                probe_result = await self._async_fetch_page(probe, deadline)
+            except Exception as err:  # mesmo contrato do gather abaixo
+                probe_result = err
+            if isinstance(probe_result, SessionExpired):
+                return [probe_result] * len(keys)
+            rest = [key for key in keys if key != probe]
+            rest_results = await self._async_fetch_pages(rest, deadline)
+            by_key = dict(zip(rest, rest_results), **{probe: probe_result})
+            return [by_key[key] for key in keys]
+        return await asyncio.gather(
+            *(self._async_fetch_page(key, deadline) for key in keys),
+            return_exceptions=True,
+        )
+
+    async def async_fleet_refresh(self):
+        """Ciclo disparado pela frota; retorna True se ele chegou a consultar o modem."""
+        self._polled = False
+        await self.async_refresh()
+        return self._polled
+
+    @callback
+    def async_start_presence_loop(self, interval):
+        """Passa a buscar a lista DHCP num laço próprio, a cada ``interval``.
+
+        O ciclo principal deixa de buscar essa página e passa a acordar no ritmo
+        das demais. Retorna a função que encerra o laço.
+        """
+        self._presence_active = True
+        self._set_poll_interval(min(spec.interval for key, spec in PAGES.items() if key != "devices"))
+        if self.fleet is not None:
+            unsub = self.fleet.add(
+                f"{self.fleet_key}/presence", self._async_presence_tick, interval.total_seconds()
             )
-            if cookies_str:
-                request_data += f"Cookie: {cookies_str}\r\n"
-            request_data += "\r\n"
-
-            # Abre a conexão socket
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(REQUEST_TIMEOUT)
-            sock.connect((self.host, 80))
-            sock.sendall(request_data.encode())
-
-            # Lê a resposta em chunks
-            response_bytes = b""
-            while True:
-                try:
-                    chunk = sock.recv(4096)
-                    if not chunk:
-                        break
-                    response_bytes += chunk
-                except socket.timeout:
-                    break
-            sock.close()
-
-            # Decodifica para string
-            full_response = response_bytes.decode("iso-8859-1", errors="ignore")
-
-            # TRUQUE: Encontrar onde começa o HTML real para ignorar headers quebrados
-            # Procura por <!DOCTYPE ou <html
-            start_index = full_response.find("<!DOCTYPE")
-            if start_index == -1:
-                start_index = full_response.find("<html")
-            
-            if start_index != -1:
-                clean_html = full_response[start_index:]
-                _LOGGER.debug("HTML extraído via Socket com sucesso (%d caracteres)", len(clean_html))
-                return clean_html
-            else:
-                # Se não achou tag HTML, retorna tudo (fallback)
-                _LOGGER.warning("Tag HTML não encontrada no socket, retornando resposta completa.")
-                return full_response
+        else:
+            unsub = async_track_time_interval(self.hass, self._async_presence_tick, interval)
 
-        except Exception as e:
-            _LOGGER.error("Erro no Raw Socket para %s: %s", path, e)
-            return None
+        @callback
+        def _stop():
+            unsub()
+            self._presence_active = False
+            self._set_poll_interval(SCAN_INTERVAL)
 
-    def _blocking_fetch_url(self, path):
-        """Método padrão de fetch para páginas que respeitam o protocolo HTTP."""
-        url = self._base_url + path
-        headers = {'Referer': f"{self._base_url}/cgi-bin/sophia_index.cgi"}
-        try:
-            response = self.session.get(url, timeout=REQUEST_TIMEOUT, headers=headers)
-            response.raise_for_status()
-            if "login" in response.url:
-                raise UpdateFailed("Sessão expirada (redirecionado para login).")
-            return response.content.decode("iso-8859-1", errors="ignore")
-        except Exception as e:
-            _LOGGER.warning("Erro no fetch padrão para %s: %s", path, e)
-            raise
+        return _stop
 
-    async def _fetch_url_with_session(self, path):
-        """Wrapper assíncrono para o fetch padrão."""
-        return await self.hass.async_add_executor_job(self._blocking_fetch_url, path)
+    def consumed_sections(self):
+        """Seções de coordinator.data lidas por algum ouvinte (entidade ativa ou plataforma).
+
+        Cada ouvinte informa as seções que lê como contexto; entidades
+        desativadas não registram ouvinte. Retorna None enquanto não há nenhum
+        (ex.: primeira atualização do setup): aí todas as páginas são buscadas.
+        """
+        consumed = set()
+        for context in self.async_contexts():
+            consumed.update(context)
+        return consumed or None
+
+    def _set_poll_interval(self, interval):
+        """Muda o ritmo base do ciclo principal, no timer próprio ou na frota."""
+        self._base_poll_interval = interval
+        self._apply_poll_interval()
+
+    def _apply_poll_interval(self):
+        """Aplica o ritmo base multiplicado pelo fator de backoff da saúde do modem."""
+        interval = self._base_poll_interval * self.health.backoff
+        if interval == self.poll_interval:
+            return
+        if self.health.backoff > 1:
+            _LOGGER.info("Modem %s lento ou falhando; próxima atualização em %s.", self.host, interval)
+        self.poll_interval = interval
+        if self.fleet is not None:
+            self.fleet.set_interval(self.fleet_key, interval.total_seconds())
+        else:
+            self.update_interval = interval
+
+    async def _async_presence_tick(self, _now=None):
+        """Busca só a lista DHCP e notifica os ouvintes se algum cliente mudou.
+
+        Entidades de Wi-Fi e do modem continuam vendo as mesmas seções e não
+        regravam estado; só os sensores de presença afetados são atualizados.
+        """
+        if self.data is None or self._presence_lock.locked():
+            return
+        # Com backoff, só um a cada ``backoff`` tiques vai ao modem
+        self._presence_ticks += 1
+        if self._presence_ticks % self.health.backoff or not self.health.allow_request():
+            return
+        key = "devices"
+        async with self._presence_lock:
+            deadline = time.monotonic() + CYCLE_BUDGET
+            session = self.client.session_started
+            try:
+                await self._async_ensure_session(deadline)
+                session = self.client.session_started
+                html = await self._async_fetch_page(key, deadline)
+            except SessionExpired:
+                # O próximo tique (ou o ciclo principal) refaz o login
+                self._invalidate_session(session)
+                return
+            except (MitraStarError, ConfigEntryAuthFailed) as err:
+                _LOGGER.debug("Falha no laço de presença: %s", err)
+                return
+
+            digest = _page_digest(html)
+            if self._digests.get(key) == digest:
+                return
+            started = time.monotonic()
+            devices, diff = self._parse_device_table(html, self.data.get(key))
+            self.stats.record_parse(key, time.monotonic() - started)
+            self._digests[key] = digest
+            if not diff:
+                return
+            self.devices_diff = diff
+            self.data = {**self.data, key: devices}
+            self.async_update_listeners()
+            self._schedule_snapshot_save()
 
     async def _async_update_data(self):
         """Função principal de atualização de dados."""
+        now = time.monotonic()
+        self.devices_diff = EMPTY_DIFF
+        # Páginas que nenhuma entidade ativa lê ficam de fora (e continuam vencidas:
+        # voltam no primeiro ciclo depois que uma entidade for reativada)
+        consumed = self.consumed_sections()
+        due = [
+            key for key in PAGES
+            if now >= self._next_fetch[key] - SCHEDULE_TOLERANCE
+            and not (key == "devices" and self._presence_active and self.data)
+            and (consumed is None or key in consumed or key not in (self.data or {}))
+        ]
+        if not due and self.data is not None:
+            # Nada vencido, mas os tiques de presença seguem medindo o modem: se ele
+            # voltou a responder bem, o backoff também diminui aqui
+            if not self.health.degraded and self.health.end_cycle():
+                self._apply_poll_interval()
+            return self.data
+        if not self.health.allow_request():
+            raise UpdateFailed(f"Modem {self.host} sem resposta; novas tentativas suspensas por ora.")
+        if self.health.state == HALF_OPEN:
+            # Disjuntor em teste: só a página mais leve vai ao modem; as demais
+            # continuam vencidas para o próximo ciclo
+            due = ["devices"]
+
+        self._polled = True
+        deadline = now + CYCLE_BUDGET
+        session = self.client.session_started
         try:
-            # Verifica se temos cookies (login feito), se não, tenta logar
-            if not self.session.cookies:
-                if not await self.hass.async_add_executor_job(self._blocking_login):
-                    raise ConfigEntryAuthFailed("Falha na re-autenticação com o modem.")
-            
-            # 1. Busca Informações do Dispositivo (Página Problemática -> Raw Socket)
-            _LOGGER.debug("Buscando about-power-box2.cgi via Socket...")
-            about_html = await self.hass.async_add_executor_job(self._fetch_raw_socket, "/cgi-bin/about-power-box2.cgi")
-            
-            # 2. Busca outras páginas (Padrão requests)
-            _LOGGER.debug("Buscando dhcp_client_list.cgi...")
-            device_list_html = await self._fetch_url_with_session("/cgi-bin/dhcp_client_list.cgi")
-            
-            _LOGGER.debug("Buscando settings-wireless-network.cgi...")
-            wifi_settings_html = await self._fetch_url_with_session("/cgi-bin/settings-wireless-network.cgi")
-            
-            _LOGGER.debug("Buscando settings-wireless-network-5g.cgi (5GHz)...")
-            wifi_5g_html = None
-            try:
-                wifi_5g_html = await self._fetch_url_with_session("/cgi-bin/settings-wireless-network-5g.cgi")
-            except Exception:
-                _LOGGER.debug("Página 5GHz não disponível ou falha no fetch; continuará sem dados 5GHz.")
-            
-            _LOGGER.debug("Buscando settings-local-network.cgi...")
-            local_network_html = await self._fetch_url_with_session("/cgi-bin/settings-local-network.cgi")
-            
-            # 3. Parsing dos dados
-            device_info = self._parse_device_info(about_html)
-            parsed_devices = self._parse_device_table(device_list_html)
-            modem_mac = self._parse_with_regex(local_network_html, r"Endereço MAC:.*?([0-9a-fA-F:]{17})", str)
-            wifi_data = self._parse_wifi_24ghz(wifi_settings_html)
-            wifi_5g_data = self._parse_wifi_5ghz(wifi_5g_html) if wifi_5g_html else None
-
-            # Consolida os dados (sem conectividade por enquanto)
-            return {
-                "device_info": device_info,
-                "devices": parsed_devices,
-                "modem_mac": modem_mac.upper() if modem_mac else None,
-                "wifi_24ghz": wifi_data,
-                "wifi_5ghz": wifi_5g_data,
-            }
+            # Reaproveita a sessão do ciclo anterior; só faz login se não houver uma
+            await self._async_ensure_session(deadline)
+            session = self.client.session_started
+
+            # 1. Busca em paralelo (limitado pelo semáforo e pelo prazo) só as páginas vencidas
+            results = await self._async_fetch_pages(due, deadline)
+
+            # Sessão expirou no modem: um único novo login e nova tentativa das páginas afetadas
+            expired = [idx for idx, result in enumerate(results) if isinstance(result, SessionExpired)]
+            if expired:
+                _LOGGER.debug("Sessão expirada no modem; refazendo o login.")
+                self._invalidate_session(session)
+                await self._async_ensure_session(deadline)
+                session = self.client.session_started
+                retried = await self._async_fetch_pages([due[idx] for idx in expired], deadline)
+                for idx, result in zip(expired, retried):
+                    results[idx] = result
+
+            # 2. Páginas opcionais (5GHz) podem falhar; as demais são obrigatórias
+            for key, result in zip(due, results):
+                if isinstance(result, Exception) and not PAGES[key].optional:
+                    raise result
+
+            # 3. Parsing das páginas novas, mantendo as seções que não venceram
+            data = dict(self.data or {})
+            for key, html in zip(due, results):
+                spec = PAGES[key]
+                if isinstance(html, Exception) or html is None:
+                    if spec.optional:
+                        _LOGGER.debug("Página %s não disponível ou falha no fetch; continuará sem esses dados.", spec.path)
+                        data.setdefault(key, None)
+                        # Sem tempo neste ciclo: continua vencida; outras falhas esperam o intervalo
+                        if not isinstance(html, DeadlineExceeded):
+                            self._next_fetch[key] = now + spec.interval.total_seconds()
+                    else:
+                        # Leitura tolerante falhou: mantém o último valor e tenta no próximo ciclo
+                        data.setdefault(key, getattr(self, spec.parser)(None))
+                    continue
+                self._next_fetch[key] = now + spec.interval.total_seconds()
+                digest = _page_digest(html)
+                if key in data and self._digests.get(key) == digest:
+                    # Página idêntica à anterior: reaproveita o resultado já interpretado
+                    continue
+                started = time.monotonic()
+                if key == "devices":
+                    # Reaproveita os registros inalterados e calcula o que mudou
+                    parsed, self.devices_diff = self._parse_device_table(html, data.get(key))
+                else:
+                    parsed = getattr(self, spec.parser)(html)
+                self.stats.record_parse(key, time.monotonic() - started)
+                data[key] = parsed
+                self._digests[key] = digest
+            self._schedule_snapshot_save()
+            return data
         except Exception as err:
             _LOGGER.error("Erro ao atualizar dados: %s", err)
-            # Limpa cookies para forçar login na próxima tentativa
-            self.session.cookies.clear()
+            self.stats.record_failure(type(err).__name__)
+            # Só descarta a sessão quando ela é inválida; erros transitórios (timeout,
+            # parsing) mantêm os cookies para o próximo ciclo
+            if isinstance(err, (SessionExpired, ConfigEntryAuthFailed)):
+                self._invalidate_session(session)
             raise UpdateFailed(f"Erro ao atualizar dados: {err}") from err
+        finally:
+            self.stats.record_cycle(time.monotonic() - now)
+            self.health.end_cycle()
+            self._apply_poll_interval()
 
     # --- MÉTODOS DE PARSING (REGEX) ---
 
     def _parse_device_info(self, html):
-        """Extrai informações do dispositivo da página about."""
-        if not html: return {}
-
-        # Regex para capturar valores baseados nos IDs da tabela
-        # Padrão: id='MLG_Vendor' ... </td><td>VALOR</td>
-        def get_val(elem_id):
-            # CORREÇÃO AQUI: Usando rf"..." (Raw F-String) para evitar SyntaxWarning
-            regex = rf"id=['\"]{elem_id}['\"][^>]*>.*?</span>.*?</td>\s*<td>(.*?)</td>"
-            val = self._parse_with_regex(html, regex, str, re.DOTALL)
-            return val.strip() if val else None
-
-        return {
-            "fabricante": get_val("MLG_Vendor") or "MitraStar",
-            "modelo": get_val("MLG_Model") or "GPT-2741GNAC-N1",
-            "software_version": get_val("MLG_SW_Version"),
-            "hardware_version": get_val("MLG_HW_Version"),
-            "serial_number": get_val("MLG_Serial_Number"),
-            "gpon_serial": get_val("MLG_GPON_Serial_Number"),
-            "mac_wan": get_val("MLG_WAN_MAC_Address"),
-            "mac_lan": get_val("MLG_LAN_MAC_Address"),
-        }
+        """Extrai informações do dispositivo da página about (via parsers.py)."""
+        return parsers.parse_device_info(html)
 
+    def _parse_modem_mac(self, html):
+        """Extrai o MAC do modem da página de rede local (via parsers.py)."""
+        return parsers.parse_modem_mac(html)
+
+    def _parse_connectivity_info(self, html):
+        """Visão preguiçosa da página de status (via parsers.py): as seções são lidas sob demanda."""
+        return parsers.parse_sophia_info(html)
 
     def _parse_wifi_24ghz(self, html):
         """Delegate parsing of 2.4GHz WiFi to parsers.py."""
@@ -305,91 +672,31 @@ class MitraStarCoordinator(DataUpdateCoordinator):
 
     def _parse_wifi_5ghz(self, html):
         """Delegate parsing of 5GHz WiFi to parsers.py."""
+        if not html:
+            return None
         try:
             return parsers.parse_wifi_5ghz(html)
         except Exception as e:
             _LOGGER.exception("Erro ao parsear 5GHz via parsers.parse_wifi_5ghz: %s", e)
             return {}
 
-    def _parse_device_table(self, html):
-        """Extrai lista de dispositivos DHCP."""
-        devices = {}
-        if not html: return devices
-        
-        # Procura linhas da tabela
-        table_rows = re.findall(r'<tr>(.*?)</tr>', html, re.DOTALL)
-        for row in table_rows:
-            cells = re.findall(r'<td[^>]*>(.*?)</td>', row, re.IGNORECASE)
-            # Espera pelo menos 4 células: Hostname, MAC, IP, Lease
-            if len(cells) >= 4:
-                hostname = cells[0].strip()
-                mac = cells[1].strip().upper()
-                ip = cells[2].strip()
-                lease = cells[3].strip()
-                
-                # Validação básica de MAC
-                if mac and ":" in mac and len(mac) == 17:
-                    devices[mac] = {
-                        "hostname": hostname, 
-                        "ip_address": ip, 
-                        "lease_time": lease
-                    }
-        return devices
+    def _parse_device_table(self, html, previous=None):
+        """Extrai a lista de dispositivos DHCP como registros compactos.
+
+        Retorna ``(devices, diff)``: um mapeamento somente leitura MAC -> ClientRecord
+        e os MACs adicionados/removidos/alterados em relação a ``previous``.
+        """
+        return build_devices(parsers.iter_device_rows(html), previous)
 
     def _parse_with_regex(self, html, regex, cast_type=str, flags=re.DOTALL):
         """Helper para extração segura com regex."""
-        if not html: return None
-        match = re.search(regex, html, flags)
-        if match:
-            try:
-                return cast_type(match.group(1).strip())
-            except (ValueError, IndexError):
-                return None
-        return None
-
-    def _get_selected_value(self, html, select_name):
-        """Try multiple strategies to find the selected value for a <select>.
-
-        Strategies (in order):
-        - <select name="..."> ... <option value="X" selected
-        - <select name="..." value="X"
-        - inspect the <select> block and find any <option[^>]*selected[^>]*value="X"
-        - fallback: find a nearby label/td containing a known mode string
-        Returns the raw value (string) or None.
-        """
-        if not html or not select_name:
+        # Padrões compilados uma única vez pelo registro de parsers.py (str ou bytes)
+        try:
+            value = parsers._parse_with_regex(html, regex, flags)
+            return cast_type(value) if value is not None else None
+        except (ValueError, IndexError):
             return None
 
-        # 1) direct option with selected
-        regex1 = rf'name="{select_name}"[^>]*>.*?<option[^>]*selected[^>]*value="([^"]+)"'
-        val = self._parse_with_regex(html, regex1, str, re.DOTALL)
-        if val:
-            return val
-
-        # 2) option with selected attribute maybe after value
-        regex2 = rf'name="{select_name}"[^>]*>.*?<option[^>]*value="([^"]+)"[^>]*selected'
-        val = self._parse_with_regex(html, regex2, str, re.DOTALL)
-        if val:
-            return val
-
-        # 3) select itself carries value attribute
-        regex3 = rf'name="{select_name}"[^>]*value="([^"]+)"'
-        val = self._parse_with_regex(html, regex3, str, re.DOTALL)
-        if val:
-            return val
-
-        # 4) locate the select block and search for an option marked by 'selected' without value
-        regex4 = rf'name="{select_name}"[^>]*>(.*?)</select>'
-        block = self._parse_with_regex(html, regex4, str, re.DOTALL)
-        if block:
-            m = re.search(r'value="([^"]+)"[^>]*selected', block)
-            if m:
-                return m.group(1)
-
-        # 5) fallback: try to extract visible text for a nearby label (common layouts)
-        regex5 = rf'{select_name}[^>]*>.*?</select>.*?</td>\s*<td[^>]*>([^<]+)</td>'
-        val = self._parse_with_regex(html, regex5, str, re.DOTALL)
-        if val:
-            return val
-
-        return None
+    def _get_selected_value(self, html, select_name):
+        """Retorna o valor selecionado de um <select> (via parsers.py, padrões em cache)."""
+        return parsers._get_selected_value(html, select_name)
@@ -0,0 +1,621 @@
+"""Cliente HTTP assíncrono para o modem MitraStar N1.
+
+O transporte é feito diretamente sobre ``asyncio.open_connection``: nenhuma
+thread do executor fica presa esperando o modem, e o parser de resposta é
+tolerante aos cabeçalhos malformados que algumas páginas (about-power-box2.cgi)
+devolvem. Este módulo não depende do Home Assistant e pode ser testado isoladamente.
+"""
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from typing import NamedTuple
+from urllib.parse import urlencode, urljoin, urlsplit
+
+_LOGGER = logging.getLogger(__name__)
+
+BROWSER_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:145.0) Gecko/20100101 Firefox/145.0"
+DEFAULT_TIMEOUT = 30
+MAX_REDIRECTS = 5
+MAX_HEADER_LINES = 100
+READ_CHUNK_SIZE = 8192
+# Sem framing, a leitura tolerante encerra após esse silêncio do modem (segundos)
+LENIENT_IDLE_TIMEOUT = 5
+# Idade máxima (s) de uma sessão recém-validada para ser adotada por outro cliente
+SESSION_HANDOFF_TTL = 120
+
+# Métodos que podem ir por uma conexão reaproveitada (e ser repetidos se ela morreu)
+IDEMPOTENT_METHODS = ("GET", "HEAD")
+
+LOGIN_PATH = "/cgi-bin/login.cgi"
+REFERER_PATH = "/cgi-bin/sophia_index.cgi"
+
+SID_RE = re.compile(r"var sid = '([a-f0-9]+)';")
+
+
+class MitraStarError(Exception):
+    """Erro genérico de comunicação com o modem."""
+
+
+class CannotConnect(MitraStarError):
+    """Falha de conexão, timeout ou resposta HTTP de erro."""
+
+
+class DeadlineExceeded(CannotConnect):
+    """O prazo do ciclo de atualização acabou antes da resposta."""
+
+
+class InvalidAuth(MitraStarError):
+    """O modem recusou as credenciais (ou não devolveu o SID/cookie de sessão)."""
+
+
+class SessionExpired(MitraStarError):
+    """A sessão expirou (o modem redirecionou para a página de login)."""
+
+
+class SessionState(NamedTuple):
+    """Sessão autenticada exportável de um cliente para outro."""
+
+    cookies: dict
+    started: float
+    last_activity: float
+
+
+class HttpResponse:
+    """Resposta HTTP mínima devolvida pelo transporte."""
+
+    __slots__ = ("status", "headers", "body", "path")
+
+    def __init__(self, status, headers, body, path):
+        self.status = status
+        self.headers = headers  # lista de tuplas (nome em minúsculas, valor)
+        self.body = body
+        self.path = path
+
+    def header(self, name):
+        """Retorna o primeiro valor do cabeçalho ``name`` (ou None)."""
+        name = name.lower()
+        for key, value in self.headers:
+            if key == name:
+                return value
+        return None
+
+    def text(self):
+        """Decodifica o corpo com o charset usado pelo modem."""
+        return self.body.decode("iso-8859-1", errors="ignore")
+
+
+def _parse_status_line(line):
+    parts = line.split(None, 2)
+    if len(parts) >= 2 and parts[0].startswith(b"HTTP/") and parts[1].isdigit():
+        return int(parts[1])
+    return 0
+
+
+def _is_blank(line):
+    return line in (b"\r\n", b"\n", b"")
+
+
+async def _async_read_head(reader, status_line=None):
+    """Lê a linha de status e os cabeçalhos, ignorando linhas quebradas.
+
+    Retorna ``(status, headers, leftover)``. Quando o modem "esquece" a linha
+    em branco e o HTML começa no meio dos cabeçalhos, ``leftover`` guarda essa
+    primeira linha do corpo para que nada seja perdido. ``status_line`` é a
+    primeira linha, se quem chamou já a leu.
+    """
+    if status_line is None:
+        status_line = await reader.readline()
+    status = _parse_status_line(status_line)
+    if not status and status_line.lstrip().startswith(b"<"):
+        return 0, [], status_line
+
+    headers = []
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if _is_blank(line):
+            break
+        if line.lstrip().startswith(b"<"):
+            return status, headers, line
+        name, sep, value = line.partition(b":")
+        name = name.strip()
+        if not sep or not name or b" " in name:
+            # Linha malformada: o modem às vezes envia lixo no meio dos cabeçalhos
+            continue
+        headers.append((name.decode("iso-8859-1").lower(), value.strip().decode("iso-8859-1")))
+    return status, headers, b""
+
+
+async def _async_read_exactly(reader, size, prefix=b""):
+    """Lê ``size`` bytes num buffer pré-alocado, sem concatenações.
+
+    Levanta IncompleteReadError se a conexão fechar antes do fim do corpo.
+    """
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    filled = min(len(prefix), size)
+    view[:filled] = prefix[:filled]
+    while filled < size:
+        chunk = await reader.read(min(READ_CHUNK_SIZE, size - filled))
+        if not chunk:
+            break
+        view[filled:filled + len(chunk)] = chunk
+        filled += len(chunk)
+    view.release()
+    if filled < size:
+        # Conexão fechada antes do fim: uma página cortada não pode passar por completa
+        raise asyncio.IncompleteReadError(bytes(buffer[:filled]), size)
+    return buffer
+
+
+def _chunk_size(size_line, received):
+    """Tamanho do próximo chunk; IncompleteReadError se a linha faltar ou vier inválida."""
+    try:
+        return int(size_line.split(b";", 1)[0].strip(), 16)
+    except ValueError:
+        raise asyncio.IncompleteReadError(bytes(received), None) from None
+
+
+async def _async_read_chunked(reader):
+    """Decodifica um corpo ``Transfer-Encoding: chunked``.
+
+    Levanta IncompleteReadError se o framing terminar antes do chunk final.
+    """
+    body = bytearray()
+    while True:
+        size = _chunk_size(await reader.readline(), body)
+        if size == 0:
+            # Consome trailers opcionais até a linha em branco final
+            while not _is_blank(await reader.readline()):
+                pass
+            return body
+        try:
+            body += await reader.readexactly(size)
+        except asyncio.IncompleteReadError as err:
+            raise asyncio.IncompleteReadError(bytes(body + err.partial), None) from None
+        await reader.readline()  # CRLF que fecha o chunk
+
+
+async def _async_read_until_eof(reader, idle_timeout=None, prefix=b""):
+    """Lê até o modem fechar a conexão (ou ficar ``idle_timeout`` segundos sem enviar nada)."""
+    body = bytearray(prefix)
+    while True:
+        try:
+            chunk = await asyncio.wait_for(reader.read(READ_CHUNK_SIZE), idle_timeout)
+        except asyncio.TimeoutError:
+            break
+        if not chunk:
+            break
+        body += chunk
+    return body
+
+
+async def _async_stream_body(reader, response, leftover, idle_timeout, extractor):
+    """Entrega o corpo a ``extractor.feed`` pedaço a pedaço, sem acumulá-lo.
+
+    Para assim que o extractor indicar que já tem tudo. Retorna True se o
+    corpo foi lido até o fim do framing (só então a conexão pode ser reaproveitada).
+    Um corpo cortado antes do fim do framing levanta IncompleteReadError.
+    """
+    if leftover and extractor.feed(leftover):
+        return False
+    length = response.header("content-length")
+    if "chunked" in (response.header("transfer-encoding") or "").lower() and not leftover:
+        while True:
+            size = _chunk_size(await reader.readline(), b"")
+            if size == 0:
+                while not _is_blank(await reader.readline()):
+                    pass
+                return True
+            while size > 0:
+                chunk = await reader.read(min(READ_CHUNK_SIZE, size))
+                if not chunk:
+                    raise asyncio.IncompleteReadError(b"", size)
+                size -= len(chunk)
+                if extractor.feed(chunk):
+                    return False
+            await reader.readline()  # CRLF que fecha o chunk
+    if length is not None and length.isdigit():
+        remaining = int(length) - len(leftover)
+        while remaining > 0:
+            chunk = await reader.read(min(READ_CHUNK_SIZE, remaining))
+            if not chunk:
+                raise asyncio.IncompleteReadError(b"", remaining)
+            remaining -= len(chunk)
+            if extractor.feed(chunk):
+                return False
+        return True
+    while True:
+        try:
+            chunk = await asyncio.wait_for(reader.read(READ_CHUNK_SIZE), idle_timeout)
+        except asyncio.TimeoutError:
+            return False
+        if not chunk or extractor.feed(chunk):
+            return False
+
+
+async def _async_read_response(reader, path, idle_timeout=None, extractor=None, status_line=None):
+    """Lê uma resposta HTTP/1.1 respeitando Content-Length ou chunked quando presentes.
+
+    Retorna ``(response, reusable)`` assim que o corpo estiver completo, sem
+    esperar o modem fechar a conexão. Sem framing utilizável, lê até o fim da
+    conexão; nesse caso (ou se os cabeçalhos vieram quebrados) a conexão não
+    pode ser reaproveitada. Com ``extractor``, o corpo vai para ele em pedaços
+    (``response.body`` fica vazio) e a leitura pode terminar antes do fim.
+    Um corpo mais curto que o Content-Length, ou um chunked sem o chunk final,
+    levanta CannotConnect: nunca é devolvido como página completa.
+    """
+    try:
+        return await _async_read_framed(reader, idle_timeout, extractor, path, status_line)
+    except asyncio.IncompleteReadError as err:
+        raise CannotConnect(
+            f"Resposta incompleta ao acessar {path} ({len(err.partial)} bytes antes do fim da conexão)"
+        ) from err
+
+
+async def _async_read_framed(reader, idle_timeout, extractor, path, status_line=None):
+    status, headers, leftover = await _async_read_head(reader, status_line)
+    response = HttpResponse(status, headers, b"", path)
+    reusable = bool(status) and not leftover and (response.header("connection") or "").lower() != "close"
+    if status in (204, 304) or 100 <= status < 200:
+        return response, reusable
+
+    if extractor is not None:
+        complete = await _async_stream_body(reader, response, leftover, idle_timeout, extractor)
+        return response, reusable and complete
+
+    length = response.header("content-length")
+    if "chunked" in (response.header("transfer-encoding") or "").lower() and not leftover:
+        response.body = await _async_read_chunked(reader)
+    elif length is not None and length.isdigit():
+        response.body = await _async_read_exactly(reader, int(length), leftover)
+    else:
+        response.body = await _async_read_until_eof(reader, idle_timeout, leftover)
+        reusable = False
+    return response, reusable
+
+
+def _extract_html(body):
+    """Localiza o início do HTML real para ignorar cabeçalhos quebrados."""
+    start_index = body.find(b"<!DOCTYPE")
+    if start_index == -1:
+        start_index = body.find(b"<html")
+    return start_index
+
+
+class MitraStarClient:
+    """Sessão HTTP assíncrona com o modem (login desafio-resposta MD5 + cookies)."""
+
+    def __init__(self, host, username, password, timeout=DEFAULT_TIMEOUT,
+                 keep_alive=True, max_connections=1):
+        self.host = host
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.cookies = {}
+
+        # Ciclo de vida da sessão (instantes em time.monotonic)
+        self.session_started = None
+        self.last_activity = None
+        self.login_count = 0
+
+        # Conexões HTTP/1.1 persistentes, compartilhadas pelos caminhos normal e tolerante
+        self.keep_alive = keep_alive
+        self.max_connections = max(1, max_connections)
+        self._idle_connections = []
+
+        # Aceita "host" ou "host:porta"
+        hostname, sep, port = host.partition(":")
+        self._hostname = hostname
+        self._port = int(port) if sep and port.isdigit() else 80
+        self._base_url = f"http://{host}"
+
+    # --- TRANSPORTE ---
+
+    def _build_request(self, method, path, body=None, headers=None):
+        lines = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {self.host}",
+            f"User-Agent: {BROWSER_USER_AGENT}",
+            "Connection: keep-alive" if self.keep_alive else "Connection: close",
+        ]
+        for name, value in (headers or {}).items():
+            lines.append(f"{name}: {value}")
+        if self.cookies:
+            lines.append("Cookie: " + "; ".join(f"{k}={v}" for k, v in self.cookies.items()))
+        if body is not None:
+            lines.append("Content-Type: application/x-www-form-urlencoded")
+            lines.append(f"Content-Length: {len(body)}")
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("iso-8859-1")
+        if body is not None:
+            request += body
+        return request
+
+    async def _async_acquire(self, fresh=False):
+        """Reaproveita uma conexão ociosa ou abre uma nova. Retorna (reader, writer, reused).
+
+        Com ``fresh``, sempre abre uma conexão nova.
+        """
+        while self._idle_connections and not fresh:
+            reader, writer = self._idle_connections.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self._hostname, self._port), self.timeout
+        )
+        return reader, writer, False
+
+    def _release(self, reader, writer, reusable):
+        """Devolve a conexão ao pool se ela ainda puder ser usada."""
+        if reusable and self.keep_alive and len(self._idle_connections) < self.max_connections:
+            self._idle_connections.append((reader, writer))
+        else:
+            writer.close()
+
+    async def async_close(self):
+        """Fecha as conexões persistentes ociosas."""
+        self._drop_idle()
+
+    def _drop_idle(self):
+        while self._idle_connections:
+            _, writer = self._idle_connections.pop()
+            writer.close()
+
+    async def _async_send(self, method, path, body=None, headers=None, lenient=False, extractor=None):
+        """Envia uma requisição e lê a resposta com o framing HTTP.
+
+        No modo tolerante, uma resposta sem framing termina após
+        ``LENIENT_IDLE_TIMEOUT`` segundos sem dados, devolvendo o que já chegou.
+        Só GET/HEAD usam conexões reaproveitadas. Se uma delas tiver sido
+        encerrada pelo modem sem devolver nenhum byte, as demais conexões ociosas
+        são descartadas e a requisição é repetida uma única vez numa conexão
+        nova. Um POST (o login) sempre vai numa conexão nova e nunca é repetido.
+        """
+        request = self._build_request(method, path, body, headers)
+        idle_timeout = min(self.timeout, LENIENT_IDLE_TIMEOUT) if lenient else None
+        fresh = method not in IDEMPOTENT_METHODS
+        while True:
+            writer = None
+            reusable = False
+            reused = False
+            status_line = b""
+            try:
+                reader, writer, reused = await self._async_acquire(fresh)
+                deadline = time.monotonic() + self.timeout
+                writer.write(request)
+                await writer.drain()
+                status_line = await asyncio.wait_for(reader.readline(), self.timeout)
+                if status_line:
+                    response, reusable = await asyncio.wait_for(
+                        _async_read_response(reader, path, idle_timeout, extractor, status_line),
+                        max(deadline - time.monotonic(), 0),
+                    )
+                    received = response.body or (extractor is not None and extractor.received)
+                    if not response.status and not received:
+                        raise CannotConnect(f"Conexão encerrada sem resposta ao acessar {path}")
+                    return response
+                if not reused:
+                    raise CannotConnect(f"Conexão encerrada sem resposta ao acessar {path}")
+                # O modem fechou a conexão ociosa: reconecta
+                _LOGGER.debug("Conexão persistente encerrada pelo modem; reconectando.")
+            except (ConnectionError, asyncio.IncompleteReadError) as err:
+                if not reused or status_line:
+                    raise CannotConnect(f"Erro de conexão ao acessar {path}: {err}") from err
+                _LOGGER.debug("Conexão persistente resetada (%s); reconectando.", err)
+            except asyncio.TimeoutError as err:
+                raise CannotConnect(f"Timeout ao acessar {path}") from err
+            except (OSError, ValueError) as err:
+                raise CannotConnect(f"Erro de conexão ao acessar {path}: {err}") from err
+            finally:
+                if writer is not None:
+                    self._release(reader, writer, reusable)
+            # As outras conexões ociosas provavelmente também morreram
+            self._drop_idle()
+            fresh = True
+
+    def _store_cookies(self, headers):
+        for name, value in headers:
+            if name != "set-cookie":
+                continue
+            cookie_name, sep, cookie_value = value.split(";", 1)[0].partition("=")
+            if sep and cookie_name.strip():
+                self.cookies[cookie_name.strip()] = cookie_value.strip()
+
+    async def async_request(self, method, path, data=None, headers=None):
+        """Executa uma requisição seguindo redirecionamentos, como um navegador."""
+        body = urlencode(data).encode("iso-8859-1") if data is not None else None
+        for _ in range(MAX_REDIRECTS + 1):
+            response = await self._async_send(method, path, body, headers)
+            self._store_cookies(response.headers)
+            status = response.status
+            location = response.header("location")
+            if status not in (301, 302, 303, 307, 308) or not location:
+                return response
+            target = urlsplit(urljoin(self._base_url + path, location))
+            path = target.path + (f"?{target.query}" if target.query else "")
+            if status in (301, 302, 303):
+                method, body = "GET", None
+        raise CannotConnect(f"Redirecionamentos demais ao acessar {path}")
+
+    # --- SESSÃO ---
+
+    @property
+    def has_session(self):
+        """True se há uma sessão autenticada que ainda não foi invalidada."""
+        return bool(self.cookies) and self.session_started is not None
+
+    @property
+    def session_age(self):
+        """Segundos desde o último login (None sem sessão)."""
+        if self.session_started is None:
+            return None
+        return time.monotonic() - self.session_started
+
+    @property
+    def session_idle(self):
+        """Segundos desde a última resposta autenticada (None sem sessão)."""
+        if self.last_activity is None:
+            return None
+        return time.monotonic() - self.last_activity
+
+    def invalidate_session(self):
+        """Descarta a sessão atual; o próximo acesso precisa de novo login."""
+        self.cookies.clear()
+        self.session_started = None
+        self.last_activity = None
+
+    def _touch(self):
+        self.last_activity = time.monotonic()
+
+    # --- API DE ALTO NÍVEL ---
+
+    def export_session(self):
+        """Retorna a sessão atual como SessionState (None sem sessão)."""
+        if not self.has_session:
+            return None
+        return SessionState(dict(self.cookies), self.session_started, self.last_activity)
+
+    def adopt_session(self, state, max_age=SESSION_HANDOFF_TTL):
+        """Assume uma sessão exportada por outro cliente, se ainda for recente.
+
+        Retorna True se a sessão foi adotada; assim o próximo acesso dispensa o login.
+        """
+        if not state or not state.cookies:
+            return False
+        if time.monotonic() - state.last_activity > max_age:
+            return False
+        self.cookies = dict(state.cookies)
+        self.session_started = state.started
+        self.last_activity = state.last_activity
+        return True
+
+    async def async_authenticate(self):
+        """Realiza o login desafio-resposta no modem.
+
+        Lança InvalidAuth se o modem recusar as credenciais e CannotConnect em
+        falhas de rede.
+        """
+        login_url = self._base_url + LOGIN_PATH
+        # 1. Obter a página de login para pegar o 'sid' (salt)
+        get_response = await self.async_request("GET", LOGIN_PATH)
+        if get_response.status >= 400:
+            raise CannotConnect(f"HTTP {get_response.status} na página de login")
+
+        sid_match = SID_RE.search(get_response.text())
+        if not sid_match:
+            raise InvalidAuth("Não foi possível encontrar o SID na página de login.")
+        sid = sid_match.group(1)
+
+        # 2. Calcular o hash da senha (senha:sid)
+        challenge_string = f"{self.password}:{sid}"
+        hashed_password = hashlib.md5(challenge_string.encode('utf-8')).hexdigest()
+
+        # 3. Enviar POST de login
+        login_payload = {
+            'Loginuser': self.username,
+            'LoginPasswordValue': hashed_password,
+            'acceptLoginIndex': '1'
+        }
+        post_response = await self.async_request(
+            "POST", LOGIN_PATH, data=login_payload, headers={'Referer': login_url}
+        )
+
+        # Verifica sucesso (se redirecionou ou setou cookie)
+        if "login" in post_response.text().lower() or not self.cookies:
+            raise InvalidAuth("Credenciais inválidas ou erro no processamento.")
+
+        _LOGGER.info("Autenticação bem-sucedida com o modem.")
+        self.session_started = self.last_activity = time.monotonic()
+        self.login_count += 1
+
+    async def async_login(self):
+        """Realiza o login desafio-resposta no modem. Retorna True em caso de sucesso."""
+        try:
+            await self.async_authenticate()
+            return True
+        except InvalidAuth as err:
+            _LOGGER.error("Falha no login: %s", err)
+            return False
+        except MitraStarError as err:
+            _LOGGER.error("Erro de conexão durante o login: %s", err)
+            return False
+
+    async def async_fetch(self, path, decode=True):
+        """Busca uma página que respeita o protocolo HTTP e devolve o HTML.
+
+        Com ``decode=False`` devolve os bytes crus (ISO-8859-1), sem cópia em str.
+        """
+        response = await self.async_request(
+            "GET", path, headers={'Referer': self._base_url + REFERER_PATH}
+        )
+        if response.status >= 400:
+            raise CannotConnect(f"HTTP {response.status} ao acessar {path}")
+        if "login" in response.path:
+            raise SessionExpired("Sessão expirada (redirecionado para login).")
+        self._touch()
+        return response.text() if decode else response.body
+
+    async def async_fetch_raw(self, path, decode=True):
+        """
+        Busca a página ignorando a validação HTTP, para contornar o cabeçalho
+        malformado do modem. Devolve o HTML a partir de <!DOCTYPE/<html.
+        Com ``decode=False`` devolve uma memoryview desse trecho dos bytes crus.
+        """
+        _LOGGER.debug("Iniciando leitura tolerante para: %s", path)
+        response = await self._async_send(
+            "GET", path, headers={'Referer': self._base_url + REFERER_PATH}, lenient=True
+        )
+        self._store_cookies(response.headers)
+        if "login" in (response.header("location") or ""):
+            raise SessionExpired("Sessão expirada (redirecionado para login).")
+        self._touch()
+        body = response.body
+        # Procura o início do HTML direto nos bytes, decodificando só o trecho útil
+        start_index = _extract_html(body)
+        if start_index != -1 and not decode:
+            return memoryview(body)[start_index:]
+        if start_index != -1:
+            clean_html = str(memoryview(body)[start_index:], "iso-8859-1", "ignore")
+            _LOGGER.debug("HTML extraído com sucesso (%d caracteres)", len(clean_html))
+            return clean_html
+        # Se não achou tag HTML, retorna tudo (fallback)
+        _LOGGER.warning("Tag HTML não encontrada na resposta, retornando resposta completa.")
+        return body.decode("iso-8859-1", errors="ignore") if decode else body
+
+    async def async_fetch_fields(self, path, extractor, lenient=False):
+        """Busca uma página entregando o corpo a ``extractor`` enquanto ele chega.
+
+        Assim que ``extractor.feed`` indicar que já capturou todos os campos, a
+        leitura para e a conexão é descartada: o restante da página nem é
+        transferido. Com ``lenient``, usa a leitura tolerante a cabeçalhos
+        malformados. Retorna o próprio extractor.
+        """
+        response = await self._async_send(
+            "GET", path, headers={'Referer': self._base_url + REFERER_PATH}, lenient=lenient, extractor=extractor
+        )
+        self._store_cookies(response.headers)
+        if "login" in (response.header("location") or ""):
+            raise SessionExpired("Sessão expirada (redirecionado para login).")
+        if response.status >= 400:
+            raise CannotConnect(f"HTTP {response.status} ao acessar {path}")
+        if not extractor.done:
+            extractor.finish()
+        self._touch()
+        return extractor
+
+
+async def async_validate_login(host, username, password, timeout=DEFAULT_TIMEOUT):
+    """Valida as credenciais com um login completo e devolve a sessão obtida.
+
+    A conexão é fechada, mas a SessionState retornada pode ser adotada pelo
+    cliente definitivo (``MitraStarClient.adopt_session``) sem novo login.
+    Lança InvalidAuth ou CannotConnect.
+    """
+    client = MitraStarClient(host, username, password, timeout=timeout)
+    try:
+        await client.async_authenticate()
+        return client.export_session()
+    finally:
+        await client.async_close()
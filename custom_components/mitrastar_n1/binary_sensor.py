@@ -2,8 +2,8 @@
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.core import callback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN
+from .entity import MitraStarEntity
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
@@ -12,10 +12,12 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     added_macs = set()
     
     @callback
-    def _add_new_devices():
+    def _add_new_devices(macs=None):
         """Adiciona sensores para novos dispositivos detectados."""
-        current_macs = set(coordinator.data.get("devices", {}).keys())
-        new_macs = current_macs - added_macs
+        # Nas atualizações, basta olhar os MACs que o coordinator marcou como novos
+        if macs is None:
+            macs = coordinator.devices_diff.added
+        new_macs = macs - added_macs
         
         if new_macs:
             new_entities = [
@@ -26,14 +28,15 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
             added_macs.update(new_macs)
     
     # Adiciona dispositivos iniciais
-    _add_new_devices()
+    _add_new_devices(set(coordinator.data.get("devices", {})))
     
-    # Registra listener para futuras atualizações
-    coordinator.async_add_listener(_add_new_devices)
+    # Registra listener para futuras atualizações (lê a seção de dispositivos)
+    config_entry.async_on_unload(coordinator.async_add_listener(_add_new_devices, ("devices",)))
 
-class MitraStarDeviceSensor(CoordinatorEntity, BinarySensorEntity):
+class MitraStarDeviceSensor(MitraStarEntity, BinarySensorEntity):
     """Sensor para dispositivos conectados ao modem."""
     _attr_has_entity_name = True
+    _sections = ("devices", "modem_mac")
 
     def __init__(self, coordinator, mac_address: str):
         super().__init__(coordinator)
@@ -41,6 +44,15 @@ class MitraStarDeviceSensor(CoordinatorEntity, BinarySensorEntity):
         self._attr_unique_id = mac_address
         self._attr_device_class = "presence"
 
+    def _section_snapshot(self):
+        """Olha só o registro deste MAC: os demais clientes não afetam a entidade."""
+        data = self.coordinator.data or {}
+        return (
+            self.coordinator.last_update_success,
+            data.get("modem_mac"),
+            data.get("devices", {}).get(self._mac),
+        )
+
     @property
     def device_info(self):
         """Cria um dispositivo individual para cada cliente conectado."""
@@ -50,7 +62,7 @@ class MitraStarDeviceSensor(CoordinatorEntity, BinarySensorEntity):
         if not device:
             return None
         
-        hostname = device.get("hostname", "Unknown")
+        hostname = device.hostname
         if hostname == "Unknown" or not hostname:
             hostname = f"Device {self._mac[-8:].replace(':', '')}"
         
@@ -69,8 +81,9 @@ class MitraStarDeviceSensor(CoordinatorEntity, BinarySensorEntity):
     @property
     def name(self):
         """Retorna o nome do dispositivo, usando o hostname se disponível."""
-        if self._device_data and self._device_data.get("hostname") != "Unknown":
-            return self._device_data.get("hostname")
+        device = self._device_data
+        if device and device.hostname != "Unknown":
+            return device.hostname
         return f"Dispositivo {self._mac.replace(':', '')[-6:]}"
 
     @property
@@ -81,11 +94,12 @@ class MitraStarDeviceSensor(CoordinatorEntity, BinarySensorEntity):
     @property
     def extra_state_attributes(self):
         """Retorna os atributos ricos do dispositivo."""
-        if not self.is_on or not self._device_data:
+        device = self._device_data
+        if not device:
             return None
         return {
-            "hostname": self._device_data.get("hostname"),
-            "ip_address": self._device_data.get("ip_address"),
-            "lease_time": self._device_data.get("lease_time"),
+            "hostname": device.hostname,
+            "ip_address": device.ip_address,
+            "lease_time": device.lease_time,
             "mac_address": self._mac
         }
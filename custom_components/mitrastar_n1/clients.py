@@ -0,0 +1,70 @@
+"""Connected-client (DHCP lease) bookkeeping for MitraStar N1.
+
+Keeps one compact, immutable record per client and computes what changed
+between two refreshes of the DHCP client list so that only the affected
+entities are touched. Independent of Home Assistant.
+"""
+import sys
+from types import MappingProxyType
+from typing import NamedTuple
+
+
+class ClientRecord(NamedTuple):
+    """One DHCP lease. A tuple subclass: no per-instance ``__dict__``."""
+    hostname: str
+    ip_address: str
+    lease_time: str
+
+    def as_dict(self):
+        return self._asdict()
+
+
+class DeviceDiff(NamedTuple):
+    """MACs added, removed and changed between two refreshes."""
+    added: frozenset = frozenset()
+    removed: frozenset = frozenset()
+    changed: frozenset = frozenset()
+
+    @property
+    def touched(self):
+        return self.added | self.removed | self.changed
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+EMPTY_DIFF = DeviceDiff()
+
+
+EMPTY_DEVICES = MappingProxyType({})
+
+
+def build_devices(rows, previous=None):
+    """Build the read-only client mapping from parsed DHCP rows.
+
+    ``rows`` yields ``(mac, hostname, ip_address, lease_time)`` tuples. MACs and
+    hostnames are interned (the same few strings come back every refresh) and
+    records equal to the ones in ``previous`` are reused as-is. Returns
+    ``(devices, diff)``; when nothing changed ``previous`` itself is returned,
+    so identity checks are enough downstream.
+    """
+    if previous is None:
+        previous = EMPTY_DEVICES
+    devices = {}
+    changed = []
+    for mac, hostname, ip_address, lease_time in rows:
+        mac = sys.intern(mac)
+        old = previous.get(mac)
+        if old is not None and old.hostname == hostname and old.ip_address == ip_address \
+                and old.lease_time == lease_time:
+            devices[mac] = old
+            continue
+        devices[mac] = ClientRecord(sys.intern(hostname), ip_address, lease_time)
+        if old is not None:
+            changed.append(mac)
+
+    added = frozenset(devices.keys() - previous.keys())
+    removed = frozenset(previous.keys() - devices.keys())
+    if not (added or removed or changed):
+        return previous, EMPTY_DIFF
+    return MappingProxyType(devices), DeviceDiff(added, removed, frozenset(changed))
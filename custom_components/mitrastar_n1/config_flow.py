@@ -6,67 +6,38 @@
 
 import logging
 import voluptuous as vol
-import requests
-import re
-import hashlib
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_USERNAME, CONF_PASSWORD
 
-from .const import DOMAIN
+from .api import CannotConnect, InvalidAuth, async_validate_login
+from .const import DOMAIN, PENDING_SESSIONS
 
 _LOGGER = logging.getLogger(__name__)
 
+# Timeout (s) das requisições durante a validação
+VALIDATE_TIMEOUT = 10
 
-def _blocking_validate_input(host, username, password):
-    """Executa a validação de login com desafio-resposta MD5."""
-    session = requests.Session()
-    login_url = f"http://{host}/cgi-bin/login.cgi"
-    headers = {'Referer': login_url}
 
-    try:
-        # --- PASSO 1: Obter a página de login para extrair o 'sid' ---
-        _LOGGER.debug("Executando GET inicial para extrair o 'sid'...")
-        get_response = session.get(login_url, timeout=10)
-        get_response.raise_for_status()
-        
-        initial_html = get_response.content.decode("iso-8859-1", errors="ignore")
-        
-        # --- PASSO 2: Extrair o 'sid' usando Regex ---
-        sid_match = re.search(r"var sid = '([a-f0-9]+)';", initial_html)
-        if not sid_match:
-            _LOGGER.error("Não foi possível encontrar o 'sid' na página de login.")
-            return {"error": "invalid_auth"}
-        sid = sid_match.group(1)
-        _LOGGER.debug("Extraído 'sid': %s", sid)
-
-        # --- PASSO 3: Calcular o hash da senha ---
-        challenge_string = f"{password}:{sid}"
-        hashed_password = hashlib.md5(challenge_string.encode('utf-8')).hexdigest()
-        
-        # --- PASSO 4: Montar e enviar o payload correto ---
-        login_payload = {
-            'Loginuser': username,
-            'LoginPasswordValue': hashed_password,
-            'acceptLoginIndex': '1'
-        }
-        
-        _LOGGER.debug("Enviando payload de login com hash...")
-        post_response = session.post(login_url, data=login_payload, headers=headers, timeout=10)
-        post_response.raise_for_status()
-        
-        post_response_text = post_response.content.decode("iso-8859-1", errors="ignore")
-        if "login" in post_response_text.lower() or not session.cookies:
-            _LOGGER.error("Validação final falhou. Modem rejeitou o hash ou não enviou cookies.")
-            return {"error": "invalid_auth"}
-
-        _LOGGER.info("Validação de login com desafio-resposta bem-sucedida!")
-        return {"title": f"MitraStar ({host})"}
+async def _async_validate_input(hass, host, username, password):
+    """Executa a validação de login com desafio-resposta MD5.
 
-    except requests.exceptions.RequestException as err:
+    Devolve também a sessão obtida; o fluxo a guarda em hass.data (só se a
+    entrada for de fato criada) para o coordinator adotá-la no setup, evitando
+    um segundo login logo em seguida.
+    """
+    try:
+        session = await async_validate_login(host, username, password, timeout=VALIDATE_TIMEOUT)
+    except InvalidAuth as err:
+        _LOGGER.error("Validação de login falhou: %s", err)
+        return {"error": "invalid_auth"}
+    except CannotConnect as err:
         _LOGGER.error("Falha de conexão na validação: %s", err)
         return {"error": "cannot_connect"}
 
+    _LOGGER.info("Validação de login com desafio-resposta bem-sucedida!")
+    return {"title": f"MitraStar ({host})", "session": session}
+
 # O restante da classe MitraStarConfigFlow permanece o mesmo e está correto
 class MitraStarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
@@ -74,9 +45,11 @@ class MitraStarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}; 
         if user_input is not None:
             host = user_input[CONF_HOST]; username = user_input[CONF_USERNAME]; password = user_input[CONF_PASSWORD]
-            info = await self.hass.async_add_executor_job(_blocking_validate_input, host, username, password)
+            info = await _async_validate_input(self.hass, host, username, password)
             if "error" not in info:
                 await self.async_set_unique_id(host); self._abort_if_unique_id_configured()
+                # Só agora: um modem já configurado aborta o fluxo acima sem deixar sessão órfã
+                self.hass.data.setdefault(PENDING_SESSIONS, {})[host] = info["session"]
                 return self.async_create_entry(title=info["title"], data=user_input)
             errors["base"] = info["error"]
         data_schema = vol.Schema({
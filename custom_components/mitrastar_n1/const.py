@@ -1,2 +1,20 @@
 """Constantes para a integração MitraStar N1."""
 DOMAIN = "mitrastar_n1"
+# hass.data: sessões recém-validadas (por host) à espera do coordinator
+PENDING_SESSIONS = f"{DOMAIN}_pending_sessions"
+# hass.data: agendador compartilhado por todos os modems (fleet.FleetScheduler)
+FLEET = f"{DOMAIN}_fleet"
+# Diagnóstico: chaves das seções com dados do assinante ou dos clientes da rede
+DIAGNOSTICS_REDACT = frozenset({
+    # Senhas de Wi-Fi
+    "password",
+    # Números de série e MACs do modem (device_info e modem_mac)
+    "serial_number", "gpon_serial", "mac_wan", "mac_lan", "modem_mac",
+    # Endereços, prefixo IPv6 e DNS da conexão (connectivity_info)
+    "ipv4_local", "ipv4_public", "ipv4_gateway", "ipv4_dns_primary", "ipv4_dns_secondary",
+    "ipv6_prefix", "ipv6_global", "ipv6_link_local", "ipv6_gateway",
+    "ipv6_dns_primary", "ipv6_dns_secondary",
+    # Hostnames por porta LAN e linhas de detalhe (hostname, MAC e IP de cada
+    # cliente cabeado ou de Wi-Fi, IP de VoIP)
+    "LAN1", "LAN2", "LAN3", "LAN4", "details",
+})
@@ -0,0 +1,49 @@
+# /config/custom_components/mitrastar_n1/diagnostics.py
+import time
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+
+from . import PAGES
+from .const import DIAGNOSTICS_REDACT, DOMAIN
+
+# Senha da entrada e dados do assinante/clientes nas seções (ver const.py)
+TO_REDACT = {CONF_PASSWORD, *DIAGNOSTICS_REDACT}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry):
+    """Diagnóstico da entrada: configuração, sessão, agenda das páginas e estatísticas dos ciclos."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    client = coordinator.client
+    data = coordinator.data or {}
+    now = time.monotonic()
+    consumed = coordinator.consumed_sections()
+
+    sections = {key: value for key, value in data.items() if key != "devices"}
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "last_update_success": coordinator.last_update_success,
+        "poll_interval": str(coordinator.poll_interval),
+        "fleet": coordinator.fleet.as_dict() if coordinator.fleet is not None else None,
+        "health": coordinator.health.as_dict(),
+        "session": {
+            "active": client.has_session,
+            "age_s": client.session_age,
+            "idle_s": client.session_idle,
+            "login_count": client.login_count,
+        },
+        "pages": {
+            key: {
+                "interval_s": spec.interval.total_seconds(),
+                "next_fetch_in_s": round(coordinator._next_fetch[key] - now, 1),
+                # False: nenhuma entidade ativa lê esta página, que não está sendo buscada
+                "consumed": consumed is None or key in consumed,
+            }
+            for key, spec in PAGES.items()
+        },
+        "stats": coordinator.stats.as_dict(),
+        "devices_count": len(data.get("devices") or {}),
+        "sections": async_redact_data(sections, TO_REDACT),
+    }
@@ -0,0 +1,40 @@
+# /config/custom_components/mitrastar_n1/entity.py
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+
+class MitraStarEntity(CoordinatorEntity):
+    """Entidade base que só grava estado quando as seções que ela lê mudam.
+
+    O coordinator reaproveita o mesmo objeto de uma seção enquanto a página de
+    origem não muda, então basta comparar identidade para saber se algo mudou.
+    As seções também são o contexto do ouvinte no coordinator: páginas que
+    nenhuma entidade ativa lê deixam de ser buscadas.
+    """
+
+    # Chaves de coordinator.data lidas pela entidade
+    _sections = ()
+
+    def __init__(self, coordinator):
+        super().__init__(coordinator, context=self._sections)
+        self._seen_sections = None
+
+    def _section_snapshot(self):
+        data = self.coordinator.data or {}
+        return (self.coordinator.last_update_success,) + tuple(
+            data.get(section) for section in self._sections
+        )
+
+    def _sections_changed(self):
+        snapshot = self._section_snapshot()
+        previous, self._seen_sections = self._seen_sections, snapshot
+        if previous is None:
+            return True
+        return any(old is not new for old, new in zip(previous, snapshot))
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Ignora atualizações que não tocaram as seções desta entidade."""
+        if not self._sections_changed():
+            return
+        super()._handle_coordinator_update()
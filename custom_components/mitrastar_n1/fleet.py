@@ -0,0 +1,153 @@
+"""Fleet-level polling for many MitraStar N1 modems in one process.
+
+A single ``FleetScheduler`` drives the periodic refreshes of every registered
+modem instead of one timer per config entry. Members are spread over their
+interval (golden-ratio offsets, so the spread stays even as modems are
+added), each fire gets a small random jitter, and ``request_slot()`` caps
+the modem requests in flight across the whole fleet. Independent of Home
+Assistant.
+"""
+import asyncio
+import contextlib
+import logging
+import random
+import time
+from collections import deque
+
+_LOGGER = logging.getLogger(__name__)
+
+# Modem requests in flight across every modem of the process
+FLEET_MAX_IN_FLIGHT = 8
+# Upper bound (s) of the random delay added to each fire; at most 10% of the interval
+FLEET_JITTER = 2.0
+# Window (s) of the polls-per-minute counter
+THROUGHPUT_WINDOW = 60.0
+
+_GOLDEN_RATIO = 0.6180339887498949
+
+
+class _Member:
+    __slots__ = ("refresh", "interval", "jitter", "slot", "fire_at", "task")
+
+    def __init__(self, refresh, interval, slot):
+        self.refresh = refresh
+        self.interval = interval
+        self.jitter = min(FLEET_JITTER, interval * 0.1)
+        self.slot = slot
+        self.fire_at = slot
+        self.task = None
+
+
+class FleetScheduler:
+    """One loop firing the refresh coroutine of every member on its own schedule."""
+
+    def __init__(self, max_in_flight=FLEET_MAX_IN_FLIGHT, clock=time.monotonic):
+        self.max_in_flight = max(1, max_in_flight)
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._clock = clock
+        self._members = {}
+        self._added = 0
+        self._polls = deque()
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def __len__(self):
+        return len(self._members)
+
+    def add(self, key, refresh, interval):
+        """Poll ``refresh()`` every ``interval`` seconds; returns a function that removes it.
+
+        ``refresh()`` returns True when it actually polled the modem; only those
+        polls count in ``polls_per_minute``. The first fire is offset inside
+        the interval so members added together do not poll together, and is
+        never immediate: the caller has just refreshed (or is refreshing).
+        """
+        offset = (1.0 - (self._added * _GOLDEN_RATIO) % 1.0) * interval
+        self._added += 1
+        self._members[key] = _Member(refresh, interval, self._clock() + offset)
+        self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._async_run())
+
+        def remove():
+            self.remove(key)
+
+        return remove
+
+    def remove(self, key):
+        member = self._members.pop(key, None)
+        if member is not None and member.task is not None:
+            member.task.cancel()
+        if not self._members and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def set_interval(self, key, interval):
+        """Change a member's interval; the next fire moves accordingly."""
+        member = self._members.get(key)
+        if member is None or member.interval == interval:
+            return
+        member.slot += interval - member.interval
+        member.interval = interval
+        member.jitter = min(FLEET_JITTER, interval * 0.1)
+        member.fire_at = member.slot
+        self._wakeup.set()
+
+    @contextlib.asynccontextmanager
+    async def request_slot(self):
+        """Hold one of the fleet-wide request slots for the duration of a modem request."""
+        async with self._semaphore:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+
+    @property
+    def polls_per_minute(self):
+        """Polls that did work over the last minute, across the fleet."""
+        cutoff = self._clock() - THROUGHPUT_WINDOW
+        while self._polls and self._polls[0] < cutoff:
+            self._polls.popleft()
+        return len(self._polls)
+
+    def as_dict(self):
+        return {
+            "members": len(self._members),
+            "polls_per_minute": self.polls_per_minute,
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+        }
+
+    async def _async_run(self):
+        while self._members:
+            now = self._clock()
+            member = min(self._members.values(), key=lambda m: m.fire_at)
+            if member.fire_at > now:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), member.fire_at - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            # Next slot on the fixed grid (skipping missed ones); jitter never accumulates
+            member.slot += member.interval
+            if member.slot <= now:
+                member.slot = now + member.interval
+            member.fire_at = member.slot + random.uniform(0, member.jitter)
+            if member.task is not None and not member.task.done():
+                continue  # previous poll still running: skip this one
+            member.task = asyncio.get_running_loop().create_task(self._async_poll(member))
+
+    async def _async_poll(self, member):
+        try:
+            polled = await member.refresh()
+        except Exception:  # pragma: no cover - the refresh handles its own errors
+            _LOGGER.exception("Unhandled error while polling a fleet member")
+            return
+        if polled:
+            self._polls.append(self._clock())
@@ -0,0 +1,136 @@
+"""Modem health tracking for adaptive polling.
+
+Watches the outcome of every request sent to one modem (response latency or
+error) and turns it into a polling decision:
+
+* a backoff factor (1, 2, 4, ... ``MAX_BACKOFF``) that stretches the poll
+  interval while responses are slow or failing, and shrinks back one step per
+  healthy cycle;
+* a circuit breaker that stops polling after ``BREAKER_FAILURES`` consecutive
+  errors, lets a single probe request through after a cooldown (doubling on
+  every failed probe) and closes again once the probe succeeds.
+
+Independent of Home Assistant.
+"""
+import time
+from collections import deque
+
+# Request outcomes considered when judging the modem
+HEALTH_WINDOW = 20
+# Median response time (s) above which the modem counts as slow
+SLOW_RESPONSE = 3.0
+# Share of failed requests in the window above which the modem counts as failing
+ERROR_RATE = 0.25
+# Largest factor applied to the poll interval
+MAX_BACKOFF = 8
+# Consecutive failed requests that open the circuit
+BREAKER_FAILURES = 5
+# Wait (s) before the first probe of an open circuit, and its upper bound
+BREAKER_COOLDOWN = 60.0
+MAX_BREAKER_COOLDOWN = 900.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ModemHealth:
+    """Latency/error window, backoff factor and circuit breaker of one modem."""
+
+    def __init__(self, window=HEALTH_WINDOW, clock=time.monotonic):
+        self._clock = clock
+        self._outcomes = deque(maxlen=window)   # latency (s) of each request, None for an error
+        self.consecutive_failures = 0
+        self.backoff = 1
+        self.state = CLOSED
+        self.cooldown = BREAKER_COOLDOWN
+        self.opened_at = None
+        self._probe_started = None
+        self.trips = 0
+
+    # --- request outcomes ---
+
+    def record_response(self, seconds):
+        self.consecutive_failures = 0
+        if self.state != CLOSED:
+            # Recovered: judge the modem from here on, stepping the backoff down per cycle
+            self._outcomes.clear()
+            self.state = CLOSED
+            self.cooldown = BREAKER_COOLDOWN
+            self.opened_at = self._probe_started = None
+        self._outcomes.append(seconds)
+
+    def record_error(self):
+        self._outcomes.append(None)
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN:
+            # Failed probe: back off further before the next one
+            self._open(min(self.cooldown * 2, MAX_BREAKER_COOLDOWN))
+        elif self.state == CLOSED and self.consecutive_failures >= BREAKER_FAILURES:
+            self.trips += 1
+            self._open(BREAKER_COOLDOWN)
+
+    def _open(self, cooldown):
+        self.state = OPEN
+        self.cooldown = cooldown
+        self.opened_at = self._clock()
+        self._probe_started = None
+        self.backoff = MAX_BACKOFF
+
+    # --- decisions ---
+
+    def allow_request(self):
+        """Whether the modem may be polled now.
+
+        With the circuit open, returns True once per cooldown: that caller's
+        next request is the probe, and its outcome closes or reopens the circuit.
+        """
+        if self.state == CLOSED:
+            return True
+        now = self._clock()
+        if self.state == OPEN and now - self.opened_at < self.cooldown:
+            return False
+        if self.state == HALF_OPEN and now - self._probe_started < self.cooldown:
+            return False  # a probe is already in flight
+        self.state = HALF_OPEN
+        self._probe_started = now
+        return True
+
+    @property
+    def error_rate(self):
+        if not self._outcomes:
+            return 0.0
+        return sum(outcome is None for outcome in self._outcomes) / len(self._outcomes)
+
+    @property
+    def median_response(self):
+        latencies = sorted(outcome for outcome in self._outcomes if outcome is not None)
+        return latencies[(len(latencies) - 1) // 2] if latencies else None
+
+    @property
+    def degraded(self):
+        median = self.median_response
+        return self.error_rate > ERROR_RATE or (median is not None and median > SLOW_RESPONSE)
+
+    def end_cycle(self):
+        """Re-evaluate the backoff after a poll cycle; returns True when it changed."""
+        if self.state != CLOSED:
+            return False
+        previous = self.backoff
+        if self.degraded:
+            self.backoff = min(self.backoff * 2, MAX_BACKOFF)
+        else:
+            self.backoff = max(self.backoff // 2, 1)
+        return self.backoff != previous
+
+    def as_dict(self):
+        median = self.median_response
+        return {
+            "state": self.state,
+            "backoff": self.backoff,
+            "error_rate": round(self.error_rate, 2),
+            "median_response_ms": None if median is None else round(median * 1000, 1),
+            "consecutive_failures": self.consecutive_failures,
+            "trips": self.trips,
+            "cooldown_s": self.cooldown,
+        }
@@ -2,19 +2,234 @@
 
 This module provides parsing helpers that are resilient to small HTML variations
 and can be unit-tested independently of Home Assistant.
+
+Every parser accepts the page either as ``str`` or as the raw ISO-8859-1
+``bytes``/``bytearray``/``memoryview`` received from the modem. On raw input the
+patterns run directly on the bytes (one byte per character) and only the
+captured values are decoded, so the page is never copied into a ``str``.
 """
+import functools
 import re
+from collections.abc import Mapping
+from html import unescape
+
+# Upper bound for patterns built at runtime (e.g. per <select> name); the
+# fixed patterns below are compiled once at import time.
+PATTERN_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def _pattern(regex, flags=0):
+    """Return a compiled pattern, compiling each (regex, flags) pair only once."""
+    return re.compile(regex, flags)
+
+
+@functools.lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def _bytes_variant(pattern):
+    """The same pattern compiled for ISO-8859-1 bytes."""
+    return _pattern(pattern.pattern.encode("iso-8859-1"), pattern.flags & ~re.UNICODE)
+
+
+def _for(html, pattern):
+    """Return ``pattern`` in the flavour (str or bytes) matching ``html``."""
+    return pattern if isinstance(html, str) else _bytes_variant(pattern)
+
+
+def _text(value):
+    """Decode a captured value taken from raw page bytes."""
+    return value if isinstance(value, str) else str(value, "iso-8859-1")
+
+
+def compile_count():
+    """Number of regex compilations done by the pattern registry so far.
+
+    Stays flat across refreshes once every pattern in use has been seen.
+    """
+    return _pattern.cache_info().misses
+
+
+MAC_RE = _pattern(r"[0-9A-Fa-f:]{17}")
+MODEM_MAC_RE = _pattern(r"Endereço MAC:.*?([0-9a-fA-F:]{17})", re.DOTALL)
+TABLE_ROW_RE = _pattern(r'<tr>(.*?)</tr>', re.DOTALL)
+TABLE_CELL_RE = _pattern(r'<td[^>]*>(.*?)</td>', re.IGNORECASE)
+FREQ_BAND_24_RE = _pattern(r'MLG_GVTSettings_WL_Advanced_FrBand[^>]*>[^<]*</span></td>\s*<td[^>]*>([^<]*)</td>', re.DOTALL)
+FREQ_BAND_5_RE = _pattern(r'MLG_GVTSettings_WL_Advanced_FrBand5G[^>]*>[^<]*</span></td>\s*<td[^>]*>([^<]*)</td>', re.DOTALL)
+
+# Values of the device table on about-power-box2.cgi, keyed by element id.
+# Pattern: id='MLG_Vendor' ... </td><td>VALUE</td>
+DEVICE_INFO_IDS = {
+    "fabricante": "MLG_Vendor",
+    "modelo": "MLG_Model",
+    "software_version": "MLG_SW_Version",
+    "hardware_version": "MLG_HW_Version",
+    "serial_number": "MLG_Serial_Number",
+    "gpon_serial": "MLG_GPON_Serial_Number",
+    "mac_wan": "MLG_WAN_MAC_Address",
+    "mac_lan": "MLG_LAN_MAC_Address",
+}
+DEVICE_INFO_DEFAULTS = {"fabricante": "MitraStar", "modelo": "GPT-2741GNAC-N1"}
+DEVICE_INFO_RES = {
+    key: _pattern(rf"id=['\"]{elem_id}['\"][^>]*>.*?</span>.*?</td>\s*<td>(.*?)</td>", re.DOTALL)
+    for key, elem_id in DEVICE_INFO_IDS.items()
+}
+
+# Fields needed from the prefix-only pages, as (anchor, pattern) for StreamExtractor.
+# The anchor is a literal every match contains; the MLG_* ids / "Endereço MAC:".
+DEVICE_INFO_FIELDS = {key: (DEVICE_INFO_IDS[key], regex) for key, regex in DEVICE_INFO_RES.items()}
+MODEM_MAC_FIELDS = {"modem_mac": ("Endereço MAC:", MODEM_MAC_RE)}
+# Characters a pattern may match before its anchor (e.g. ``id='``)
+STREAM_ANCHOR_SLACK = 16
+
+# Form controls and their attributes, for the single-pass FormIndex
+_FORM_TAG_RE = _pattern(r'<(/?)(input|select|option|textarea)\b([^>]*)>', re.IGNORECASE)
+_ATTR_RE = _pattern(r'([A-Za-z_:][-\w:.]*)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+)))?')
+
+
+def _parse_attrs(raw):
+    attrs = {}
+    for m in _for(raw, _ATTR_RE).finditer(raw):
+        name = _text(m.group(1)).lower()
+        if name in attrs:
+            continue
+        value = m.group(2)
+        if value is None:
+            value = m.group(3) if m.group(3) is not None else m.group(4)
+        attrs[name] = value if value is None else _text(value)
+    return attrs
+
+
+class FormIndex:
+    """Index of every form control in a page, built in a single pass.
+
+    Walks the HTML once and records, per control name, the first ``value``
+    attribute, the values of checked inputs and the selected option of each
+    ``<select>``. Lookups are then plain dict accesses.
+    """
+
+    def __init__(self, html):
+        self._values = {}     # name -> (document order, value)
+        self._checked = {}    # name -> set of values of checked inputs ('' when no value)
+        self._selected = {}   # select name -> selected option value (or the select's own value)
+        self._build(html or '')
+
+    def _build(self, html):
+        select_name = None
+        with_selected_option = set()
+        for order, m in enumerate(_for(html, _FORM_TAG_RE).finditer(html)):
+            closing, tag = m.group(1), _text(m.group(2)).lower()
+            if closing:
+                if tag == 'select':
+                    select_name = None
+                continue
+            attrs = _parse_attrs(m.group(3))
+            if tag == 'select':
+                select_name = attrs.get('name')
+                if select_name and attrs.get('value'):
+                    self._selected.setdefault(select_name, attrs['value'])
+                continue
+            if tag == 'option':
+                # The first selected option wins over the select's own value attribute
+                if (select_name and select_name not in with_selected_option
+                        and 'selected' in attrs and attrs.get('value')):
+                    self._selected[select_name] = attrs['value']
+                    with_selected_option.add(select_name)
+                continue
+            name = attrs.get('name')
+            if not name:
+                continue
+            if 'value' in attrs and name not in self._values:
+                self._values[name] = (order, (attrs['value'] or '').strip())
+            if 'checked' in attrs:
+                self._checked.setdefault(name, set()).add(attrs.get('value') or '')
+
+    def value(self, *names):
+        """Return the ``value`` of the first control (in document order) with one of ``names``."""
+        found = [self._values[n] for n in names if n in self._values]
+        return min(found)[1] if found else None
+
+    def is_checked(self, *names, value=None):
+        """True if a control named in ``names`` is checked (optionally with the given value)."""
+        for name in names:
+            checked = self._checked.get(name)
+            if checked and (value is None or value in checked):
+                return True
+        return False
+
+    def selected(self, *names):
+        """Return the selected value of the first ``<select>`` in ``names`` that has one."""
+        for name in names:
+            v = self._selected.get(name)
+            if v:
+                return v
+        return None
+
 
-MAC_RE = re.compile(r"[0-9A-Fa-f:]{17}")
+class StreamExtractor:
+    """Incremental matcher fed with the raw chunks of a page as they arrive.
+
+    ``fields`` maps a key to ``(anchor, pattern)``. Until the anchor shows up
+    only a substring search over the new bytes is done; afterwards the pattern
+    is searched from the anchor. A field is captured once its match ends
+    before the end of the received data (so it cannot grow with the next
+    chunk), and ``feed`` returns True when every field was captured, so the
+    caller can stop reading. ``buffer`` holds the prefix received so far:
+    every captured field matches in it exactly as in the full page.
+    """
+
+    def __init__(self, fields):
+        self._pending = {
+            key: (anchor.encode("iso-8859-1"), _bytes_variant(pattern))
+            for key, (anchor, pattern) in fields.items()
+        }
+        self._anchors = {}
+        self.buffer = bytearray()
+        self.matches = {}
+
+    @property
+    def done(self):
+        return not self._pending
+
+    @property
+    def received(self):
+        return len(self.buffer)
+
+    def feed(self, chunk):
+        """Add a chunk of raw bytes; True once every field was captured."""
+        scanned = len(self.buffer)
+        self.buffer += chunk
+        self._scan(scanned, final=False)
+        return self.done
+
+    def finish(self):
+        """Signal the end of the page, accepting matches that touch its end."""
+        self._scan(len(self.buffer), final=True)
+        return self.matches
+
+    def _scan(self, scanned, final):
+        data = self.buffer
+        for key, (anchor, pattern) in list(self._pending.items()):
+            pos = self._anchors.get(key)
+            if pos is None:
+                # Only the new bytes (plus a possibly split anchor) need a look
+                pos = data.find(anchor, max(0, scanned - len(anchor) + 1))
+                if pos == -1:
+                    continue
+                self._anchors[key] = pos
+            m = pattern.search(data, max(0, pos - STREAM_ANCHOR_SLACK))
+            if m and (final or m.end() < len(data)):
+                self.matches[key] = _text(m.group(1)).strip()
+                del self._pending[key]
 
 
 def _parse_with_regex(html, regex, flags=re.DOTALL):
     if not html:
         return None
-    m = re.search(regex, html, flags)
+    if isinstance(regex, str):
+        regex = _pattern(regex, flags)
+    m = _for(html, regex).search(html)
     if not m:
         return None
-    return m.group(1).strip()
+    return _text(m.group(1)).strip()
 
 
 def _get_selected_value(html, select_name):
@@ -43,7 +258,7 @@ def _get_selected_value(html, select_name):
     regex4 = rf'name=["\']?{re.escape(select_name)}["\']?[^>]*>(.*?)</select>'
     block = _parse_with_regex(html, regex4, re.DOTALL)
     if block:
-        m = re.search(r'value=["\']?([^"\'>\s]+)["\']?[^>]*selected', block)
+        m = _pattern(r'value=["\']?([^"\'>\s]+)["\']?[^>]*selected').search(block)
         if m:
             return m.group(1)
 
@@ -59,12 +274,52 @@ def _get_selected_value(html, select_name):
 def _extract_mac(html):
     if not html:
         return None
-    m = MAC_RE.search(html)
+    m = _for(html, MAC_RE).search(html)
     if m:
-        return m.group(0).upper()
+        return _text(m.group(0)).upper()
     return None
 
 
+def parse_device_info(html):
+    """Parse the device table of about-power-box2.cgi."""
+    if not html:
+        return {}
+    info = {}
+    for key, regex in DEVICE_INFO_RES.items():
+        val = _parse_with_regex(html, regex)
+        info[key] = val or DEVICE_INFO_DEFAULTS.get(key)
+    return info
+
+
+def iter_device_rows(html):
+    """Yield ``(mac, hostname, ip_address, lease_time)`` for each row of dhcp_client_list.cgi."""
+    if not html:
+        return
+    cell_re = _for(html, TABLE_CELL_RE)
+    for row in _for(html, TABLE_ROW_RE).findall(html):
+        cells = cell_re.findall(row)
+        # Expect at least 4 cells: Hostname, MAC, IP, Lease
+        if len(cells) >= 4:
+            mac = _text(cells[1]).strip().upper()
+            # Basic MAC validation
+            if mac and ":" in mac and len(mac) == 17:
+                yield mac, _text(cells[0]).strip(), _text(cells[2]).strip(), _text(cells[3]).strip()
+
+
+def parse_device_table(html):
+    """Parse dhcp_client_list.cgi into {MAC: {hostname, ip_address, lease_time}}."""
+    return {
+        mac: {"hostname": hostname, "ip_address": ip, "lease_time": lease}
+        for mac, hostname, ip, lease in iter_device_rows(html)
+    }
+
+
+def parse_modem_mac(html):
+    """Extract the modem MAC address from settings-local-network.cgi."""
+    modem_mac = _parse_with_regex(html, MODEM_MAC_RE)
+    return modem_mac.upper() if modem_mac else None
+
+
 def parse_wifi_24ghz(html):
     """Parse 2.4GHz wireless page HTML and return a dict of values."""
     if not html:
@@ -75,23 +330,25 @@ def parse_wifi_24ghz(html):
     mode_map = {'1': '802.11b', '4': '802.11g', '0': '802.11b/g', '6': '802.11n', '7': '802.11g/n', '9': '802.11b/g/n'}
     bandwidth_map = {'1': 'Automático', '0': '20 MHz', '2': '40 MHz'}
 
-    wifi_enabled = bool(re.search(r'name=["\']?WifiState["\']?[^>]*value=["\']?1["\']?[^>]*checked', html, re.DOTALL))
-    ssid_broadcast = bool(re.search(r'name=["\']?broadcastSSID["\']?[^>]*checked', html, re.DOTALL))
+    form = FormIndex(html)
+
+    wifi_enabled = form.is_checked('WifiState', value='1')
+    ssid_broadcast = form.is_checked('broadcastSSID')
 
-    ssid = _parse_with_regex(html, r'name=["\']?SSID["\']?[^>]*value=["\']?([^"\']*)["\']?', re.DOTALL)
-    password = _parse_with_regex(html, r'name=["\']?wlPasswd["\']?[^>]*value=["\']?([^"\']*)["\']?', re.DOTALL)
+    ssid = form.value('SSID')
+    password = form.value('wlPasswd')
 
-    security_code = _get_selected_value(html, 'securityMode') or _parse_with_regex(html, r'name=["\']?securityMode["\']?[^>]*>.*?<option[^>]*selected[^>]*value=["\']?([^"\'>\s]+)["\']?', re.DOTALL)
-    mode_code = _get_selected_value(html, 'selectWifiMode') or _parse_with_regex(html, r'name=["\']?selectWifiMode["\']?[^>]*>.*?<option[^>]*selected[^>]*value=["\']?([^"\'>\s]+)["\']?', re.DOTALL)
-    channel_code = _get_selected_value(html, 'select_Channel') or _parse_with_regex(html, r'name=["\']?select_Channel["\']?[^>]*>.*?<option[^>]*selected[^>]*value=["\']?([^"\'>\s]+)["\']?', re.DOTALL)
-    bandwidth_code = _get_selected_value(html, 'select_Bandwidth') or _parse_with_regex(html, r'name=["\']?select_Bandwidth["\']?[^>]*>.*?<option[^>]*selected[^>]*value=["\']?([^"\'>\s]+)["\']?', re.DOTALL)
+    security_code = form.selected('securityMode')
+    mode_code = form.selected('selectWifiMode')
+    channel_code = form.selected('select_Channel')
+    bandwidth_code = form.selected('select_Bandwidth')
 
-    wps_enabled = bool(re.search(r'name=["\']?input_wps["\']?[^>]*value=["\']?1["\']?[^>]*checked', html, re.DOTALL))
-    wmm_enabled = bool(re.search(r'name=["\']?input_WMM["\']?[^>]*checked', html, re.DOTALL))
+    wps_enabled = form.is_checked('input_wps', value='1')
+    wmm_enabled = form.is_checked('input_WMM')
 
     wifi_mac = _extract_mac(html)
 
-    frequency_band = _parse_with_regex(html, r'MLG_GVTSettings_WL_Advanced_FrBand[^>]*>[^<]*</span></td>\s*<td[^>]*>([^<]*)</td>', re.DOTALL)
+    frequency_band = _parse_with_regex(html, FREQ_BAND_24_RE)
 
     return {
         'enabled': wifi_enabled,
@@ -118,23 +375,25 @@ def parse_wifi_5ghz(html):
     mode_text_map = {'802_11n/ac': '802.11n/ac', '802_11ac': '802.11ac', '802_11n': '802.11n', '1': '802.11a', '4': '802.11ac', '6': '802.11n', '9': '802.11ac/n'}
     bandwidth_map = {'2040auto': 'Automático', '20': '20 MHz', '40': '40 MHz', '80': '80 MHz', '160': '160 MHz', '1': 'Automático', '0': '20 MHz', '2': '40 MHz', '3': '80 MHz'}
 
-    wifi_enabled = bool(re.search(r'name=["\']?(?:WifiState5G|WifiState)["\']?[^>]*value=["\']?1["\']?[^>]*checked', html, re.DOTALL))
-    ssid_broadcast = bool(re.search(r'name=["\']?(?:HideSSID|broadcastSSID5G)["\']?[^>]*checked', html, re.DOTALL))
+    form = FormIndex(html)
 
-    ssid = _parse_with_regex(html, r'name=["\']?SSID(?:5G)?["\']?[^>]*value=["\']?([^"\']*)["\']?', re.DOTALL)
-    password = _parse_with_regex(html, r'name=["\']?wlPasswd(?:5G)?["\']?[^>]*value=["\']?([^"\']*)["\']?', re.DOTALL)
+    wifi_enabled = form.is_checked('WifiState5G', 'WifiState', value='1')
+    ssid_broadcast = form.is_checked('HideSSID', 'broadcastSSID5G')
 
-    security_code = _get_selected_value(html, 'securityMode_5G') or _get_selected_value(html, 'securityMode5G') or _get_selected_value(html, 'securityMode')
-    mode_code_raw = _get_selected_value(html, 'select2') or _get_selected_value(html, 'selectWifiMode5G') or _get_selected_value(html, 'selectWifiMode')
-    channel_code = _get_selected_value(html, 'select_Channel_5G') or _get_selected_value(html, 'select_Channel5G') or _get_selected_value(html, 'select_Channel')
-    bandwidth_code = _get_selected_value(html, 'select_Bandwidth_5G') or _get_selected_value(html, 'select_Bandwidth5G') or _get_selected_value(html, 'select_Bandwidth')
+    ssid = form.value('SSID', 'SSID5G')
+    password = form.value('wlPasswd', 'wlPasswd5G')
 
-    wps_enabled = bool(re.search(r'name=["\']?input_wps(?:5G)?["\']?[^>]*value=["\']?1["\']?[^>]*checked', html, re.DOTALL))
-    wmm_enabled = bool(re.search(r'name=["\']?input_WMM(?:5G)?["\']?[^>]*checked', html, re.DOTALL))
+    security_code = form.selected('securityMode_5G', 'securityMode5G', 'securityMode')
+    mode_code_raw = form.selected('select2', 'selectWifiMode5G', 'selectWifiMode')
+    channel_code = form.selected('select_Channel_5G', 'select_Channel5G', 'select_Channel')
+    bandwidth_code = form.selected('select_Bandwidth_5G', 'select_Bandwidth5G', 'select_Bandwidth')
+
+    wps_enabled = form.is_checked('input_wps', 'input_wps5G', value='1')
+    wmm_enabled = form.is_checked('input_WMM', 'input_WMM5G')
 
     wifi_mac = _extract_mac(html)
 
-    frequency_band = _parse_with_regex(html, r'MLG_GVTSettings_WL_Advanced_FrBand5G[^>]*>[^<]*</span></td>\s*<td[^>]*>([^<]*)</td>', re.DOTALL)
+    frequency_band = _parse_with_regex(html, FREQ_BAND_5_RE)
 
     security = security_map.get(security_code, security_code if security_code else 'Desconhecido')
     operation_mode = mode_text_map.get(mode_code_raw, mode_code_raw if mode_code_raw else 'Desconhecido')
@@ -155,3 +414,194 @@ def parse_wifi_5ghz(html):
         'wmm': wmm_enabled,
         'frequency_band': frequency_band if frequency_band else '5 GHz',
     }
+
+
+# --- sophia_info.cgi (status overview) ---
+
+# Each block of the status table starts at a <th> heading; blocks without a
+# name (the guest hotspot) only bound their neighbours.
+SOPHIA_HEADING_RE = _pattern(r'<th>\s*<img[^>]*>\s*<span>([^<]*)</span>', re.DOTALL)
+SOPHIA_TABLE_END_RE = _pattern(r'</table>')
+SOPHIA_STATUS_RE = _pattern(r'<div class="status-line[^"]*"[^>]*>(.*?)</div>', re.DOTALL)
+SOPHIA_LABEL_RE = _pattern(r'<strong>(.*?)</strong>(.*)', re.DOTALL)
+SOPHIA_PAIR_RE = _pattern(r'<li class="li_par">(.*?)</li>\s*<li class="li_impar">(.*?)</li>', re.DOTALL)
+SOPHIA_ADDRESS_TABLE_RE = _pattern(r'<div id="internet_(v[46])_table">\s*<ul>(.*?)</ul>', re.DOTALL)
+SOPHIA_LIST_ITEM_RE = _pattern(r'<li>(.*?)</li>', re.DOTALL)
+# Text filled into the infoDisplay_* textareas (wlan_information etc.) by inline scripts
+SOPHIA_CONSOLE_RE = _pattern(r'var catFile_(\w+) = "([^"]*)";')
+_BR_RE = _pattern(r'<br\s*/?>', re.IGNORECASE)
+_TAG_RE = _pattern(r'<[^>]*>')
+_SPACES_RE = _pattern(r'\s+')
+
+# Status table heading (lowercase) -> section key
+SOPHIA_SECTIONS = {
+    "gpon": "gpon",
+    "internet": "internet",
+    "wi-fi 2.4ghz": "wlan_24ghz",
+    "wi-fi 5ghz": "wlan_5ghz",
+    "rede local": "lan",
+    "tv": "tv",
+    "telefone": "voip",
+}
+# Section key -> suffix of the catFile_* variable feeding its textarea
+SOPHIA_CONSOLES = {"wlan_24ghz": "24g", "wlan_5ghz": "5g", "lan": "lan", "tv": "tv", "voip": "voip"}
+# Field label (lowercase, without the colon) -> key; other labels are kept as shown
+SOPHIA_LABELS = {
+    "link": "link",
+    "potência rx": "rx_power_dbm",
+    "potência tx": "tx_power_dbm",
+    "ppp": "ppp",
+    "sessão ppp": "ppp_session",
+    "ssid": "ssid",
+    "segurança": "security",
+    "wps": "wps",
+    "anúncio do ssid": "ssid_broadcast",
+    "canal": "channel",
+    "rede": "network",
+    "telefone": "phone",
+}
+# Rows of the IPv4/IPv6 address lists, in page order
+SOPHIA_ADDRESS_KEYS = {
+    "v4": ("ipv4_local", "ipv4_public", "ipv4_gateway", "ipv4_dns_primary", "ipv4_dns_secondary"),
+    "v6": ("ipv6_prefix", "ipv6_link_local", "ipv6_global", "ipv6_gateway", "ipv6_dns_primary",
+           "ipv6_dns_secondary"),
+}
+
+
+def _clean(value):
+    """Visible text of an HTML fragment: tags dropped, entities decoded, spaces collapsed."""
+    text = _TAG_RE.sub(" ", unescape(_text(value)))
+    return _SPACES_RE.sub(" ", text).strip()
+
+
+def _label_key(label):
+    label = label.rstrip(":").strip()
+    return SOPHIA_LABELS.get(label.lower(), label)
+
+
+def _dbm(value):
+    try:
+        return float(value.split()[0])
+    except (IndexError, ValueError):
+        return None
+
+
+class SophiaInfo(Mapping):
+    """Section-indexed view of sophia_info.cgi, parsed on demand.
+
+    Building it only locates the blocks of the status table (GPON, Internet,
+    Wi-Fi, local network, TV, phone); a section is parsed the first time it is
+    read and then cached, so a page whose sections nobody reads costs one
+    heading scan. Keys are the values of ``SOPHIA_SECTIONS``; each section is a
+    flat dict, plus ``details`` with the lines of its textarea when it has one.
+    """
+
+    def __init__(self, html):
+        if not isinstance(html, (str, bytes)):
+            html = bytes(html)   # keep the page, not a view of a reused buffer
+        self._html = html
+        self._spans = {}
+        self._parsed = {}
+        self._consoles = None
+        self._table_end = len(html)
+        self._index()
+
+    def _index(self):
+        html = self._html
+        end = _for(html, SOPHIA_TABLE_END_RE).search(html)
+        if end:
+            self._table_end = end.start()
+        headings = [
+            (m.start(), _clean(m.group(1)).lower())
+            for m in _for(html, SOPHIA_HEADING_RE).finditer(html, 0, self._table_end)
+        ]
+        for (start, name), (stop, _) in zip(headings, headings[1:] + [(self._table_end, None)]):
+            key = SOPHIA_SECTIONS.get(name)
+            if key and key not in self._spans:
+                self._spans[key] = (start, stop)
+
+    @property
+    def parsed(self):
+        """Sections parsed so far."""
+        return tuple(self._parsed)
+
+    def __getitem__(self, key):
+        section = self._parsed.get(key)
+        if section is None:
+            start, stop = self._spans[key]
+            section = self._parsed[key] = self._parse_section(key, self._html[start:stop])
+        return section
+
+    def __contains__(self, key):
+        return key in self._spans
+
+    def __iter__(self):
+        return iter(self._spans)
+
+    def __len__(self):
+        return len(self._spans)
+
+    def __eq__(self, other):
+        # Same page, same sections: never parse everything just to compare
+        if isinstance(other, SophiaInfo):
+            return self._html == other._html
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"SophiaInfo(sections={list(self._spans)}, parsed={list(self._parsed)})"
+
+    def as_dict(self):
+        """Every section, parsed."""
+        return {key: self[key] for key in self}
+
+    def _parse_section(self, key, block):
+        section = {}
+        for m in _for(block, SOPHIA_STATUS_RE).finditer(block):
+            labelled = _for(block, SOPHIA_LABEL_RE).match(m.group(1).strip())
+            if not labelled:
+                continue
+            label = _clean(labelled.group(1))
+            parts = _for(block, _BR_RE).split(labelled.group(2), 1)
+            value = _clean(parts[0])
+            status = _clean(parts[1]) if len(parts) > 1 else ""
+            if not value:
+                value, status = status, ""
+            if not value:
+                # A bare heading, e.g. <strong>Indisponível</strong>
+                section.setdefault("status", label)
+                continue
+            name = _label_key(label)
+            section.setdefault(name, value)
+            if status:
+                section.setdefault("status", status)
+        for m in _for(block, SOPHIA_PAIR_RE).finditer(block):
+            section.setdefault(_label_key(_clean(m.group(1))), _clean(m.group(2)))
+        for m in _for(block, SOPHIA_ADDRESS_TABLE_RE).finditer(block):
+            values = [_clean(item) for item in _for(block, SOPHIA_LIST_ITEM_RE).findall(m.group(2))]
+            section.update(zip(SOPHIA_ADDRESS_KEYS[_text(m.group(1))], values))
+        for name in ("rx_power_dbm", "tx_power_dbm"):
+            if name in section:
+                section[name] = _dbm(section[name])
+        console = SOPHIA_CONSOLES.get(key)
+        if console is not None:
+            section["details"] = self._console_lines(console)
+        return section
+
+    def _console_lines(self, name):
+        if self._consoles is None:
+            self._consoles = {}
+            html = self._html
+            for m in _for(html, SOPHIA_CONSOLE_RE).finditer(html, self._table_end):
+                line = _clean(m.group(2))
+                if line:
+                    self._consoles.setdefault(_text(m.group(1)).lower(), []).append(line)
+        return list(self._consoles.get(name, ()))
+
+
+def parse_sophia_info(html):
+    """Lazily parsed, section-indexed view of sophia_info.cgi (None without a page)."""
+    if not html:
+        return None
+    return SophiaInfo(html)
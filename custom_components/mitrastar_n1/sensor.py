@@ -1,15 +1,28 @@
 # /config/custom_components/mitrastar_n1/sensor.py
 import logging
-from homeassistant.components.sensor import SensorEntity
+from datetime import timedelta
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import SIGNAL_STRENGTH_DECIBELS_MILLIWATT, EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
+from .entity import MitraStarEntity
 _LOGGER = logging.getLogger(__name__)
 # No runtime monkey-patch imports here; parsing is implemented in __init__.py
 
+# Só os sensores de diagnóstico são consultados periodicamente: as estatísticas
+# mudam a cada ciclo mesmo quando os dados do modem não mudam
+SCAN_INTERVAL = timedelta(seconds=60)
+
+# Métricas de coordinator.stats expostas como sensores (chave -> nome)
+STATS_SENSORS = {
+    "cycle": "Duração da Atualização",
+    "login": "Tempo de Login",
+}
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -21,12 +34,18 @@ async def async_setup_entry(
         MitraStarDeviceInfo(coordinator),
         MitraStarWifi(coordinator),   # 2.4GHz
         MitraStarWifi5G(coordinator), # 5GHz
+        MitraStarInternet(coordinator),
+        MitraStarGponSignal(coordinator),
     ]
+    # Diagnóstico dos ciclos (desativados por padrão no registro de entidades)
+    sensors += [MitraStarRefreshStats(coordinator, metric) for metric in STATS_SENSORS]
 
     async_add_entities(sensors)
     _LOGGER.debug("Sensores registrados: %s", [s._attr_name for s in sensors])
 
-class MitraStarDeviceInfo(CoordinatorEntity, SensorEntity):
+class MitraStarDeviceInfo(MitraStarEntity, SensorEntity):
+    _sections = ("device_info", "modem_mac")
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self._attr_name = "MitraStar Modem Info"
@@ -59,7 +78,9 @@ class MitraStarDeviceInfo(CoordinatorEntity, SensorEntity):
     def extra_state_attributes(self):
         return self.coordinator.data.get("device_info", {})
 
-class MitraStarWifi(CoordinatorEntity, SensorEntity):
+class MitraStarWifi(MitraStarEntity, SensorEntity):
+    _sections = ("wifi_24ghz", "modem_mac")
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self._attr_name = "MitraStar WiFi 2.4GHz"
@@ -84,7 +105,9 @@ class MitraStarWifi(CoordinatorEntity, SensorEntity):
         return self.coordinator.data.get("wifi_24ghz", {})
 
 
-class MitraStarWifi5G(CoordinatorEntity, SensorEntity):
+class MitraStarWifi5G(MitraStarEntity, SensorEntity):
+    _sections = ("wifi_5ghz", "wifi_24ghz", "modem_mac")
+
     def __init__(self, coordinator):
         super().__init__(coordinator)
         self._attr_name = "MitraStar WiFi 5GHz"
@@ -121,7 +144,111 @@ class MitraStarWifi5G(CoordinatorEntity, SensorEntity):
         return data or {}
 
 
+class MitraStarConnectivity(MitraStarEntity, SensorEntity):
+    """Base dos sensores da página de status (sophia_info.cgi).
+
+    ``coordinator.data["connectivity_info"]`` é uma visão preguiçosa: cada
+    sensor lê só a sua seção, e só ela é interpretada.
+    """
+    _sections = ("connectivity_info", "modem_mac")
+    # Seção de parsers.SophiaInfo lida pelo sensor
+    _info_section = None
+
+    @property
+    def device_info(self):
+        """Vincula este sensor ao dispositivo modem."""
+        modem_mac = self.coordinator.data.get("modem_mac")
+        if not modem_mac:
+            return None
+        return {"identifiers": {(DOMAIN, modem_mac)}}
+
+    def _section(self):
+        info = self.coordinator.data.get("connectivity_info")
+        if not info or self._info_section not in info:
+            return {}
+        return info[self._info_section]
+
+    @property
+    def extra_state_attributes(self):
+        return dict(self._section())
+
+
+class MitraStarInternet(MitraStarConnectivity):
+    """Estado da conexão PPP, com endereços IPv4/IPv6 e DNS nos atributos."""
+    _info_section = "internet"
+
+    def __init__(self, coordinator):
+        super().__init__(coordinator)
+        self._attr_name = "MitraStar Internet"
+        self._attr_unique_id = f"{coordinator.host}_internet"
+        self._attr_icon = "mdi:web"
+
+    @property
+    def state(self):
+        return self._section().get("ppp", "Desconhecido")
+
+
+class MitraStarGponSignal(MitraStarConnectivity):
+    """Potência óptica recebida (Rx) no GPON; estado do link e potência Tx nos atributos."""
+    _info_section = "gpon"
+    _attr_device_class = SensorDeviceClass.SIGNAL_STRENGTH
+    _attr_native_unit_of_measurement = SIGNAL_STRENGTH_DECIBELS_MILLIWATT
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator):
+        super().__init__(coordinator)
+        self._attr_name = "MitraStar Sinal GPON"
+        self._attr_unique_id = f"{coordinator.host}_gpon_rx_power"
+        self._attr_icon = "mdi:signal"
+
+    @property
+    def native_value(self):
+        return self._section().get("rx_power_dbm")
+
+
+class MitraStarRefreshStats(MitraStarEntity, SensorEntity):
+    """Mediana (p50) de uma métrica dos ciclos de atualização, em ms; contagem, p95 e máximo nos atributos.
+
+    O detalhamento por página fica só no diagnóstico: como atributo, seria
+    regravado pelo recorder a cada minuto.
+    """
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_native_unit_of_measurement = "ms"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _sections = ("modem_mac",)
+
+    def __init__(self, coordinator, metric):
+        super().__init__(coordinator)
+        self._metric = metric
+        self._attr_name = f"MitraStar {STATS_SENSORS[metric]}"
+        self._attr_unique_id = f"{coordinator.host}_stats_{metric}"
+        self._attr_icon = "mdi:timer-outline"
+
+    @property
+    def should_poll(self):
+        return True
+
+    async def async_update(self):
+        """Nada a buscar no modem: o estado vem de coordinator.stats."""
+
+    @property
+    def device_info(self):
+        """Vincula este sensor ao dispositivo modem."""
+        modem_mac = self.coordinator.data.get("modem_mac")
+        if not modem_mac:
+            return None
+        return {"identifiers": {(DOMAIN, modem_mac)}}
+
+    @property
+    def native_value(self):
+        return getattr(self.coordinator.stats, self._metric).summary()["p50"]
+
     @property
     def extra_state_attributes(self):
-        """Retorna todos os dados de conectividade PON/Internet."""
-        return self.coordinator.data.get("connectivity_info", {})
+        stats = self.coordinator.stats
+        summary = getattr(stats, self._metric).summary()
+        attributes = {key: summary[key] for key in ("count", "p95", "max")}
+        if self._metric == "login":
+            attributes["relogins"] = stats.relogins
+        return attributes
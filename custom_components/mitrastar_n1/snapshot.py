@@ -0,0 +1,65 @@
+"""Compact on-disk snapshot of the coordinator data for MitraStar N1.
+
+The last good ``coordinator.data`` is stored so entities can be restored right
+after a Home Assistant restart, before the modem answers. Sections are kept
+as plain JSON values; the DHCP client mapping is flattened to
+``[mac, hostname, ip_address, lease_time]`` rows (the same shape
+``clients.build_devices`` consumes). Lazily parsed views (such as
+``parsers.SophiaInfo``) are left out rather than parsed just to be stored;
+the first refresh brings them back. Independent of Home Assistant.
+"""
+import time
+
+SNAPSHOT_VERSION = 1
+# Snapshots older than this (seconds) are ignored at startup
+SNAPSHOT_MAX_AGE = 24 * 3600
+
+DEVICES_KEY = "devices"
+# Section values stored as they are; anything else (lazy views) is skipped
+_PLAIN_TYPES = (dict, list, str, int, float, bool)
+
+
+def encode_snapshot(data, now=None):
+    """Return a JSON-serializable snapshot of ``data`` (None if there is nothing to store)."""
+    if not data:
+        return None
+    sections = {}
+    for key, value in data.items():
+        if value is None:
+            continue
+        if key == DEVICES_KEY:
+            value = [[mac, *record] for mac, record in value.items()]
+        elif not isinstance(value, _PLAIN_TYPES):
+            continue
+        sections[key] = value
+    return {
+        "version": SNAPSHOT_VERSION,
+        "saved_at": time.time() if now is None else now,
+        "sections": sections,
+    }
+
+
+def decode_snapshot(payload, now=None, max_age=SNAPSHOT_MAX_AGE):
+    """Return ``(sections, device_rows)`` from a stored snapshot.
+
+    ``device_rows`` is a list of ``(mac, hostname, ip_address, lease_time)``
+    tuples. Returns None when the payload is missing, from another format
+    version, malformed or older than ``max_age``.
+    """
+    if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_VERSION:
+        return None
+    saved_at = payload.get("saved_at")
+    if not isinstance(saved_at, (int, float)):
+        return None
+    if (time.time() if now is None else now) - saved_at > max_age:
+        return None
+    sections = payload.get("sections")
+    if not isinstance(sections, dict):
+        return None
+    sections = dict(sections)
+    rows = sections.pop(DEVICES_KEY, None) or []
+    try:
+        device_rows = [tuple(str(field) for field in row) for row in rows if len(row) == 4]
+    except TypeError:
+        return None
+    return sections, device_rows
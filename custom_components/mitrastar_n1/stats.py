@@ -0,0 +1,104 @@
+"""Refresh-cycle instrumentation for MitraStar N1.
+
+Keeps a rolling window of recent samples per metric (cycle duration, login
+time, per-page fetch latency and size, per-parser time) plus failure
+counters, and summarizes them as percentiles for diagnostics and sensors.
+Independent of Home Assistant.
+"""
+from collections import Counter, deque
+
+# Samples kept per metric
+STATS_WINDOW = 100
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of ``samples`` (None when empty)."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, -(-pct * len(ordered) // 100))  # ceil without floats
+    return ordered[int(rank) - 1]
+
+
+class RollingStats:
+    """The last ``window`` samples of one metric."""
+
+    __slots__ = ("samples", "count")
+
+    def __init__(self, window=STATS_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, value):
+        self.samples.append(value)
+        self.count += 1
+
+    @property
+    def last(self):
+        return self.samples[-1] if self.samples else None
+
+    def summary(self, scale=1000, digits=1):
+        """``{count, last, p50, p95, max}``; values multiplied by ``scale`` (s -> ms by default)."""
+        def fmt(value):
+            return None if value is None else round(value * scale, digits)
+
+        return {
+            "count": self.count,
+            "last": fmt(self.last),
+            "p50": fmt(percentile(self.samples, 50)),
+            "p95": fmt(percentile(self.samples, 95)),
+            "max": fmt(max(self.samples, default=None)),
+        }
+
+
+class RefreshStats:
+    """Timings, sizes and failures of the coordinator refresh cycles."""
+
+    def __init__(self, window=STATS_WINDOW):
+        self._window = window
+        self.cycle = RollingStats(window)
+        self.login = RollingStats(window)
+        self.fetch = {}        # page key -> RollingStats of fetch latency (s)
+        self.page_bytes = {}   # page key -> bytes received in the last fetch
+        self.parse = {}        # page key -> RollingStats of parse time (s)
+        self.failures = Counter()
+        self.last_failure = None
+        self.relogins = 0
+
+    def _metric(self, table, key):
+        stats = table.get(key)
+        if stats is None:
+            stats = table[key] = RollingStats(self._window)
+        return stats
+
+    def record_cycle(self, seconds):
+        self.cycle.add(seconds)
+
+    def record_login(self, seconds, relogin=False):
+        self.login.add(seconds)
+        if relogin:
+            self.relogins += 1
+
+    def record_fetch(self, key, seconds, size):
+        self._metric(self.fetch, key).add(seconds)
+        self.page_bytes[key] = size
+
+    def record_parse(self, key, seconds):
+        self._metric(self.parse, key).add(seconds)
+
+    def record_failure(self, reason):
+        self.failures[reason] += 1
+        self.last_failure = reason
+
+    def as_dict(self):
+        """Summary in milliseconds, ready for diagnostics or sensor attributes."""
+        return {
+            "cycle_ms": self.cycle.summary(),
+            "login_ms": self.login.summary(),
+            "relogins": self.relogins,
+            "fetch_ms": {key: stats.summary() for key, stats in self.fetch.items()},
+            "page_bytes": dict(self.page_bytes),
+            "parse_ms": {key: stats.summary(digits=3) for key, stats in self.parse.items()},
+            "failures": dict(self.failures),
+            "last_failure": self.last_failure,
+        }
@@ -0,0 +1,258 @@
+"""Local stand-in for a MitraStar N1 web interface, built from the fixtures.
+
+Serves every ``fixtures/http_cgi-bin_<page>.htm`` at ``/cgi-bin/<page>``
+(ISO-8859-1, like the modem), implements the ``var sid`` + MD5 login
+challenge with a session cookie, and reproduces the malformed response of
+about-power-box2.cgi (broken header lines, no Content-Length, body until the
+connection closes). Faults can be injected per server: latency before each
+response, bodies trickled in small slow chunks, connection resets on chosen
+paths, bodies cut off halfway through their Content-Length and session expiry.
+
+Usage in tests::
+
+    async with FakeModem() as modem:
+        client = MitraStarClient(modem.host, modem.username, modem.password)
+
+or standalone, to poll it from Home Assistant or the scripts::
+
+    python custom_components/mitrastar_n1/tests/fake_modem.py --port 8080 --latency 0.2
+"""
+import argparse
+import asyncio
+import hashlib
+import secrets
+import time
+from pathlib import Path
+from urllib.parse import parse_qs
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+LOGIN_PATH = "/cgi-bin/login.cgi"
+INDEX_PATH = "/cgi-bin/sophia_index.cgi"
+MALFORMED_PATHS = frozenset({"/cgi-bin/about-power-box2.cgi"})
+COOKIE_NAME = "SESSIONID"
+
+
+def load_pages(fixtures_dir=FIXTURES_DIR):
+    """Map ``/cgi-bin/<page>`` to the fixture body, re-encoded as ISO-8859-1."""
+    pages = {}
+    for fixture in sorted(fixtures_dir.glob("http_cgi-bin_*.htm")):
+        path = "/cgi-bin/" + fixture.name[len("http_cgi-bin_"):-len(".htm")]
+        text = fixture.read_text(encoding="utf-8", errors="ignore")
+        pages[path] = text.encode("iso-8859-1", errors="ignore")
+    return pages
+
+
+class Faults:
+    """Injected misbehaviour; every attribute can be changed while the server runs."""
+
+    def __init__(self, latency=0.0, trickle_bytes=0, trickle_delay=0.0, reset_paths=(), session_ttl=None,
+                 truncate_paths=()):
+        self.latency = latency                # seconds before each response
+        self.trickle_bytes = trickle_bytes    # >0: send bodies in chunks of this size...
+        self.trickle_delay = trickle_delay    # ...waiting this long between chunks
+        self.reset_paths = set(reset_paths)   # paths whose requests get the connection reset
+        self.session_ttl = session_ttl        # seconds a session lives (None: forever)
+        self.truncate_paths = set(truncate_paths)  # paths whose body stops halfway, then the connection closes
+
+
+class FakeModem:
+    """asyncio HTTP/1.1 server emulating the modem's CGI pages."""
+
+    def __init__(self, username="admin", password="secret", faults=None, pages=None, host="127.0.0.1", port=0):
+        self.username = username
+        self.password = password
+        self.faults = faults or Faults()
+        self.pages = pages if pages is not None else load_pages()
+        self._bind = (host, port)
+        self._server = None
+        self._sids = set()
+        self._sessions = {}   # cookie value -> creation time
+        self._writers = set()
+        # Counters for tests and benchmarks
+        self.logins = 0
+        self.failed_logins = 0
+        self.requests = {}
+        self.bytes_sent = 0
+        self.connections = 0
+
+    @property
+    def host(self):
+        """``ip:port`` to hand to MitraStarClient."""
+        address, port = self._server.sockets[0].getsockname()[:2]
+        return f"{address}:{port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, *self._bind)
+        return self
+
+    async def stop(self):
+        self._server.close()
+        # Hang up idle keep-alive connections so their handlers end before the loop does
+        for writer in list(self._writers):
+            writer.transport.abort()
+        await self._server.wait_closed()
+        while self._writers:
+            await asyncio.sleep(0)
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    def expire_sessions(self):
+        """Drop every session: the next page request is redirected to the login page."""
+        self._sessions.clear()
+
+    # --- HTTP ---
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+                method, path, headers = self._parse_request(head)
+                length = int(headers.get("content-length", "0") or 0)
+                body = await reader.readexactly(length) if length else b""
+                self.requests[path] = self.requests.get(path, 0) + 1
+
+                if self.faults.latency:
+                    await asyncio.sleep(self.faults.latency)
+                if path in self.faults.reset_paths:
+                    writer.transport.abort()
+                    return
+                keep_open = await self._respond(writer, method, path, headers, body)
+                if not keep_open or headers.get("connection", "").lower() == "close":
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    @staticmethod
+    def _parse_request(head):
+        lines = head.decode("iso-8859-1").split("\r\n")
+        method, target = lines[0].split(" ")[:2]
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        return method, target.split("?", 1)[0], headers
+
+    def _session_valid(self, headers):
+        for part in headers.get("cookie", "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name != COOKIE_NAME or value not in self._sessions:
+                continue
+            ttl = self.faults.session_ttl
+            if ttl is None or time.monotonic() - self._sessions[value] < ttl:
+                return True
+            del self._sessions[value]
+        return False
+
+    async def _respond(self, writer, method, path, headers, body):
+        """Write one response; returns False when the connection must be closed."""
+        if path == LOGIN_PATH:
+            if method == "POST":
+                return await self._login(writer, body)
+            return await self._send(writer, 200, self._login_page())
+        if path not in self.pages and path != INDEX_PATH:
+            return await self._send(writer, 404, b"<html>Not Found</html>")
+        if not self._session_valid(headers):
+            return await self._send(writer, 302, b"", [("Location", LOGIN_PATH)])
+        if path == INDEX_PATH:
+            return await self._send(writer, 200, b"<html>index</html>")
+        if path in MALFORMED_PATHS:
+            return await self._send_malformed(writer, self.pages[path])
+        return await self._send(writer, 200, self.pages[path], truncate=path in self.faults.truncate_paths)
+
+    def _login_page(self):
+        sid = secrets.token_hex(8)
+        self._sids.add(sid)
+        return f"<html><script>var sid = '{sid}';</script><form>login</form></html>".encode()
+
+    async def _login(self, writer, body):
+        form = {key: values[0] for key, values in parse_qs(body.decode("iso-8859-1")).items()}
+        password_hash = form.get("LoginPasswordValue", "")
+        for sid in self._sids:
+            expected = hashlib.md5(f"{self.password}:{sid}".encode()).hexdigest()
+            if form.get("Loginuser") == self.username and password_hash == expected:
+                self._sids.discard(sid)
+                token = secrets.token_hex(16)
+                self._sessions[token] = time.monotonic()
+                self.logins += 1
+                return await self._send(writer, 302, b"", [
+                    ("Set-Cookie", f"{COOKIE_NAME}={token}; path=/"),
+                    ("Location", INDEX_PATH),
+                ])
+        self.failed_logins += 1
+        return await self._send(writer, 200, self._login_page())
+
+    async def _send(self, writer, status, body, extra_headers=(), truncate=False):
+        reason = {200: "OK", 302: "Found", 404: "Not Found"}.get(status, "OK")
+        head = [f"HTTP/1.1 {status} {reason}", "Content-Type: text/html", f"Content-Length: {len(body)}"]
+        head += [f"{name}: {value}" for name, value in extra_headers]
+        if truncate:
+            # Announce the whole body, send half of it and hang up
+            body = body[:len(body) // 2]
+        await self._write(writer, ("\r\n".join(head) + "\r\n\r\n").encode("iso-8859-1"), body)
+        return not truncate
+
+    async def _send_malformed(self, writer, body):
+        # Like the real page: junk header lines, no framing, body until close
+        head = b"HTTP/1.1 200 OK\r\nthis is not a header\r\nContent-Type text/html\r\n\r\n"
+        await self._write(writer, head, body)
+        return False
+
+    async def _write(self, writer, head, body):
+        writer.write(head)
+        step = self.faults.trickle_bytes
+        if step > 0:
+            for start in range(0, len(body), step):
+                if writer.is_closing():
+                    return  # the client hung up (e.g. a streaming read that got what it needed)
+                writer.write(body[start:start + step])
+                await writer.drain()
+                await asyncio.sleep(self.faults.trickle_delay)
+        else:
+            writer.write(body)
+        await writer.drain()
+        self.bytes_sent += len(head) + len(body)
+
+
+async def _serve_forever(args):
+    faults = Faults(latency=args.latency, trickle_bytes=args.trickle_bytes, trickle_delay=args.trickle_delay,
+                    session_ttl=args.session_ttl)
+    modem = FakeModem(args.username, args.password, faults=faults, host=args.host, port=args.port)
+    await modem.start()
+    print(f"Fake modem on http://{modem.host} (user {args.username!r}, password {args.password!r})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await modem.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the MitraStar N1 fixtures as a fake modem.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="secret")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before each response")
+    parser.add_argument("--trickle-bytes", type=int, default=0, help="send bodies in chunks of this size")
+    parser.add_argument("--trickle-delay", type=float, default=0.0, help="seconds between trickled chunks")
+    parser.add_argument("--session-ttl", type=float, default=None, help="seconds a login session lives")
+    try:
+        asyncio.run(_serve_forever(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
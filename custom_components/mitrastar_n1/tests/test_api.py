@@ -0,0 +1,269 @@
+import asyncio
+import pathlib
+import importlib.util
+import sys
+
+
+def _load_api_module():
+    here = pathlib.Path(__file__).parent
+    module_path = (here / '..' / 'api.py').resolve()
+    spec = importlib.util.spec_from_file_location('mitrastar_api', str(module_path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['mitrastar_api'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _serve(responses):
+    """HTTP handler answering each request with the next canned response.
+
+    The connection is only closed by the client, so responses must be framed.
+    """
+    requests_seen = []
+
+    async def handle(reader, writer):
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.IncompleteReadError:
+                break
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            body = await reader.readexactly(length) if length else b""
+            requests_seen.append(head + body)
+            writer.write(responses.pop(0))
+            await writer.drain()
+        writer.close()
+
+    return handle, requests_seen
+
+
+def _run(responses, scenario):
+    api = _load_api_module()
+
+    async def main():
+        handle, seen = _serve(responses)
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        client = api.MitraStarClient(f'127.0.0.1:{port}', 'admin', 'secret', timeout=5)
+        try:
+            return await scenario(client), seen
+        finally:
+            await client.async_close()
+            server.close()
+            await server.wait_closed()
+
+    return asyncio.run(main())
+
+
+def test_login_follows_redirect_and_keeps_cookie():
+    responses = [
+        b"HTTP/1.1 200 OK\r\nContent-Length: 36\r\n\r\n<script>var sid = 'abc123';</script>",
+        b"HTTP/1.1 302 Found\r\nSet-Cookie: SESSIONID=42; path=/\r\nLocation: /cgi-bin/sophia_index.cgi\r\n"
+        b"Content-Length: 0\r\n\r\n",
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nHello\r\n0\r\n\r\n",
+    ]
+    ok, seen = _run(responses, lambda client: client.async_login())
+    assert ok is True
+    assert b"LoginPasswordValue=" in seen[1]
+    assert b"Cookie: SESSIONID=42" in seen[2]
+
+
+def test_fetch_raw_tolerates_malformed_headers():
+    responses = [
+        b"HTTP/1.1 200 OK\r\nthis is not a header\r\nContent-Type text/html\r\nContent-Length: 39\r\n\r\n"
+        b"garbage\n<!DOCTYPE html><html>ok</html>\n",
+    ]
+    html, _ = _run(responses, lambda client: client.async_fetch_raw('/cgi-bin/about-power-box2.cgi'))
+    assert html == "<!DOCTYPE html><html>ok</html>\n"
+
+
+def test_fetch_raw_recovers_when_body_starts_inside_headers():
+    responses = [
+        b"HTTP/1.1 200 OK\r\nContent-Length: 30\r\n<html>\n<body>ok</body>\n</html>",
+    ]
+    html, _ = _run(responses, lambda client: client.async_fetch_raw('/cgi-bin/about-power-box2.cgi'))
+    assert html == "<html>\n<body>ok</body>\n</html>"
+
+
+def test_keep_alive_reuses_connection_and_reconnects_after_reset():
+    api = _load_api_module()
+    page = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        # Answer two requests on the same connection, then drop it
+        for _ in range(2):
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(page)
+            await writer.drain()
+        writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        client = api.MitraStarClient(f'127.0.0.1:{port}', 'admin', 'secret', timeout=5)
+        try:
+            return [await client.async_fetch('/cgi-bin/dhcp_client_list.cgi') for _ in range(3)]
+        finally:
+            await client.async_close()
+            server.close()
+            await server.wait_closed()
+
+    assert asyncio.run(main()) == ['ok', 'ok', 'ok']
+    assert len(connections) == 2
+
+
+def test_dead_pooled_connections_cost_one_retry_and_never_a_post():
+    api = _load_api_module()
+    page = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+    lost = []    # requests the modem read on a connection it then dropped unanswered
+    firsts = []  # (method, path) of each connection's first request
+
+    async def handle(reader, writer):
+        # Answer the first request of each connection; swallow the second and hang up
+        head = await reader.readuntil(b"\r\n\r\n")
+        firsts.append(tuple(head.split(b" ", 2)[:2]))
+        writer.write(page)
+        await writer.drain()
+        try:
+            lost.append(await reader.readuntil(b"\r\n\r\n"))
+        except asyncio.IncompleteReadError:
+            pass
+        writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        client = api.MitraStarClient(f'127.0.0.1:{port}', 'admin', 'secret', timeout=5, max_connections=2)
+        try:
+            # Two pooled connections, both dead for the next request they carry
+            await asyncio.gather(*(client.async_fetch('/a') for _ in range(2)))
+            retried = await client.async_fetch('/b')
+            await asyncio.gather(*(client.async_fetch('/c') for _ in range(2)))
+            posted = await client.async_request('POST', '/cgi-bin/login.cgi', data={'x': '1'})
+            return retried, posted
+        finally:
+            await client.async_close()
+            server.close()
+            await server.wait_closed()
+
+    retried, posted = asyncio.run(main())
+    assert retried == 'ok' and posted.status == 200
+    # /b was lost once on the first dead connection, then retried on a new one
+    # (the other dead connection was dropped, not tried)
+    assert [request.split(b" ", 2)[1] for request in lost].count(b"/b") == 1
+    # The POST went straight to a new connection
+    assert (b"POST", b"/cgi-bin/login.cgi") in firsts
+
+
+def test_fetch_detects_expired_session():
+    responses = [
+        b"HTTP/1.1 302 Found\r\nLocation: /cgi-bin/login.cgi\r\nContent-Length: 0\r\n\r\n",
+        b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nlogin",
+    ]
+
+    async def scenario(client):
+        client.cookies['SESSIONID'] = '42'
+        client.session_started = client.last_activity = 0.0
+        assert client.has_session
+        try:
+            await client.async_fetch('/cgi-bin/dhcp_client_list.cgi')
+        except sys.modules[type(client).__module__].SessionExpired:
+            client.invalidate_session()
+            return client.has_session
+        return True
+
+    has_session, _ = _run(responses, scenario)
+    assert has_session is False
+
+
+def test_validated_session_is_adopted_without_new_login():
+    responses = [
+        b"HTTP/1.1 200 OK\r\nContent-Length: 36\r\n\r\n<script>var sid = 'abc123';</script>",
+        b"HTTP/1.1 200 OK\r\nSet-Cookie: SESSIONID=42; path=/\r\nContent-Length: 2\r\n\r\nok",
+        b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nhosts",
+    ]
+
+    async def scenario(client):
+        api = sys.modules[type(client).__module__]
+        session = await api.async_validate_login(client.host, 'admin', 'secret', timeout=5)
+        assert client.adopt_session(session)
+        assert not client.adopt_session(session, max_age=-1)
+        return await client.async_fetch('/cgi-bin/dhcp_client_list.cgi'), client.login_count
+
+    (html, login_count), seen = _run(responses, scenario)
+    assert (html, login_count) == ('hosts', 0)
+    assert b"Cookie: SESSIONID=42" in seen[2]
+
+
+def test_fetch_fields_stops_reading_and_drops_connection():
+    api = _load_api_module()
+    body = b"<html><span id='mac'>AA:BB:CC:DD:EE:FF</span>" + b"x" * 65536 + b"</html>"
+    page = b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(body) + body
+    connections = []
+
+    class Extractor:
+        received = 0
+        done = False
+        text = b""
+
+        def feed(self, chunk):
+            self.received += len(chunk)
+            self.text += bytes(chunk)
+            self.done = b"</span>" in self.text
+            return self.done
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                writer.write(page)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        client = api.MitraStarClient(f'127.0.0.1:{port}', 'admin', 'secret', timeout=5)
+        try:
+            first = await client.async_fetch_fields('/cgi-bin/settings-local-network.cgi', Extractor())
+            await client.async_fetch_fields('/cgi-bin/settings-local-network.cgi', Extractor())
+            return first
+        finally:
+            await client.async_close()
+            server.close()
+            await server.wait_closed()
+
+    extractor = asyncio.run(main())
+    assert extractor.done
+    assert extractor.received < len(body)
+    assert len(connections) == 2
+
+
+def test_fetch_fields_sends_referer():
+    class Extractor:
+        received = 0
+        done = False
+
+        def feed(self, chunk):
+            self.received += len(chunk)
+            return False
+
+        def finish(self):
+            self.done = True
+
+    body = b"<html>ok</html>"
+    page = b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(body) + body
+
+    async def scenario(client):
+        return await client.async_fetch_fields('/cgi-bin/settings-local-network.cgi', Extractor())
+
+    extractor, seen = _run([page], scenario)
+    assert extractor.done
+    assert b"Referer: http://127.0.0.1:" in seen[0]
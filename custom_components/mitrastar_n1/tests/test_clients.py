@@ -0,0 +1,54 @@
+import pathlib
+import importlib.util
+import sys
+
+
+def _load_clients_module():
+    here = pathlib.Path(__file__).parent
+    module_path = (here / '..' / 'clients.py').resolve()
+    spec = importlib.util.spec_from_file_location('mitrastar_clients', str(module_path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['mitrastar_clients'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _row(mac, hostname, ip='192.168.1.10', lease='60 min'):
+    return (mac, hostname, ip, lease)
+
+
+def test_build_devices_reports_added_removed_changed():
+    clients = _load_clients_module()
+    previous, _ = clients.build_devices([_row('AA:00', 'phone'), _row('BB:00', 'tv'), _row('CC:00', 'nvr')])
+    rows = [_row('AA:00', 'phone'), _row('BB:00', 'tv', ip='192.168.1.99'), _row('DD:00', 'laptop')]
+
+    devices, diff = clients.build_devices(rows, previous)
+
+    assert diff.added == {'DD:00'}
+    assert diff.removed == {'CC:00'}
+    assert diff.changed == {'BB:00'}
+    assert diff.touched == {'BB:00', 'CC:00', 'DD:00'}
+    # Unchanged records keep their identity
+    assert devices['AA:00'] is previous['AA:00']
+    assert devices['BB:00'].ip_address == '192.168.1.99'
+
+
+def test_build_devices_without_changes_returns_previous_mapping():
+    clients = _load_clients_module()
+    previous, diff = clients.build_devices([_row('AA:00', 'phone')])
+    assert diff.added == {'AA:00'}
+    devices, diff = clients.build_devices([_row('AA:00', 'phone')], previous)
+    assert devices is previous
+    assert not diff
+
+
+def test_devices_mapping_is_read_only():
+    clients = _load_clients_module()
+    devices, _ = clients.build_devices([_row('AA:00', 'phone')])
+    try:
+        devices['BB:00'] = None
+    except TypeError:
+        pass
+    else:
+        raise AssertionError('devices mapping should be read-only')
+    assert devices['AA:00'].as_dict() == {'hostname': 'phone', 'ip_address': '192.168.1.10', 'lease_time': '60 min'}
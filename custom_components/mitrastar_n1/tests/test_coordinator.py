@@ -0,0 +1,132 @@
+import asyncio
+import pathlib
+import importlib.util
+import sys
+
+import pytest
+
+
+def _load_module(name, filename, package_dir=None):
+    here = pathlib.Path(__file__).parent
+    spec = importlib.util.spec_from_file_location(
+        name, str((here / filename).resolve()),
+        submodule_search_locations=[str(package_dir)] if package_dir else None)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+integration = _load_module('mitrastar_n1_pkg', '../__init__.py', pathlib.Path(__file__).parent.parent)
+fake_modem = _load_module('mitrastar_fake_modem', 'fake_modem.py')
+
+pytestmark = pytest.mark.skipif(integration._HAS_HA, reason='exercises the fallback coordinator')
+
+
+def _run(scenario, faults=None, **kwargs):
+    async def main():
+        async with fake_modem.FakeModem(faults=faults) as modem:
+            coordinator = integration.MitraStarCoordinator(
+                None, modem.host, modem.username, modem.password, **kwargs)
+            try:
+                return await scenario(modem, coordinator)
+            finally:
+                await coordinator.client.async_close()
+
+    return asyncio.run(main())
+
+
+def _make_all_due(coordinator):
+    coordinator._next_fetch = dict.fromkeys(coordinator._next_fetch, 0.0)
+
+
+def test_presence_tick_and_refresh_share_one_login():
+    async def scenario(modem, coordinator):
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success and modem.logins == 1
+
+        # Session lost: the main cycle and the presence tick both need a new one at once
+        coordinator.client.invalidate_session()
+        _make_all_due(coordinator)
+        await asyncio.gather(coordinator.async_refresh(), coordinator._async_presence_tick())
+        assert coordinator.last_update_success and coordinator.client.has_session
+        return modem
+
+    modem = _run(scenario, fake_modem.Faults(latency=0.05))
+    assert modem.logins == 2
+
+
+def test_cycle_deadline_covers_the_wait_for_a_request_slot(monkeypatch):
+    monkeypatch.setattr(integration, 'CYCLE_BUDGET', 0.5)
+    fleet = integration.FleetScheduler(max_in_flight=1)
+
+    async def scenario(modem, coordinator):
+        await coordinator.async_refresh()
+        _make_all_due(coordinator)
+
+        # Another modem of the fleet holds the only request slot well past the budget
+        held = asyncio.Event()
+
+        async def other_modem():
+            async with fleet.request_slot():
+                held.set()
+                await asyncio.sleep(3)
+
+        other = asyncio.ensure_future(other_modem())
+        await held.wait()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await coordinator.async_refresh()
+        elapsed = loop.time() - started
+        other.cancel()
+        return coordinator, elapsed
+
+    coordinator, elapsed = _run(scenario, fake_modem.Faults(latency=0.1), fleet=fleet)
+    assert not coordinator.last_update_success
+    assert isinstance(coordinator.last_exception.__cause__, integration.DeadlineExceeded)
+    assert elapsed < 1.0
+    assert fleet.in_flight == 0
+
+
+def test_backoff_decays_in_cycles_with_nothing_due():
+    async def scenario(modem, coordinator):
+        await coordinator.async_refresh()
+        # The modem was slow a while ago; presence now owns the DHCP list
+        coordinator._presence_active = True
+        coordinator.health.backoff = 8
+        coordinator._apply_poll_interval()
+        coordinator._presence_ticks = 7
+        await coordinator._async_presence_tick()  # healthy response
+        backoffs = []
+        for _ in range(3):
+            await coordinator.async_refresh()  # nothing due: no request
+            backoffs.append(coordinator.health.backoff)
+        return modem, coordinator, backoffs
+
+    modem, coordinator, backoffs = _run(scenario)
+    assert backoffs == [4, 2, 1]
+    assert coordinator.poll_interval == coordinator._base_poll_interval
+    assert modem.requests['/cgi-bin/dhcp_client_list.cgi'] == 2
+
+
+def test_pages_without_enabled_entities_are_never_requested():
+    unread = ('wifi_24ghz', 'wifi_5ghz', 'connectivity_info')
+
+    async def scenario(modem, coordinator):
+        # Setup: no entity yet, every page is fetched once to fill coordinator.data
+        await coordinator.async_refresh()
+        modem.requests.clear()
+
+        # Wi-Fi and connectivity entities disabled: only these sections have listeners
+        for sections in (('devices',), ('device_info',), ('modem_mac',)):
+            coordinator.async_add_listener(lambda: None, sections)
+        for _ in range(3):
+            _make_all_due(coordinator)
+            await coordinator.async_refresh()
+            assert coordinator.last_update_success
+        return modem
+
+    modem = _run(scenario)
+    for key in unread:
+        assert integration.PAGES[key].path not in modem.requests
+    assert modem.requests[integration.PAGES['devices'].path] == 3
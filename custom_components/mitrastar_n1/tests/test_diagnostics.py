@@ -0,0 +1,65 @@
+import pathlib
+import importlib.util
+import re
+import sys
+from collections.abc import Mapping
+
+
+def _load_module(name, filename):
+    here = pathlib.Path(__file__).parent
+    spec = importlib.util.spec_from_file_location(name, str((here / filename).resolve()))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+const = _load_module('mitrastar_const', '../const.py')
+parsers = _load_module('mitrastar_parsers', '../parsers.py')
+
+try:
+    from homeassistant.components.diagnostics import async_redact_data
+except ImportError:
+    def async_redact_data(data, to_redact):
+        """Same key-based walk as Home Assistant's helper."""
+        if isinstance(data, list):
+            return [async_redact_data(value, to_redact) for value in data]
+        if not isinstance(data, Mapping):
+            return data
+        redacted = {**data}
+        for key, value in redacted.items():
+            if value is None or (isinstance(value, str) and not value):
+                continue
+            if key in to_redact:
+                redacted[key] = '**REDACTED**'
+            elif isinstance(value, (Mapping, list)):
+                redacted[key] = async_redact_data(value, to_redact)
+        return redacted
+
+
+MAC_RE = re.compile(r'[0-9a-f]{2}(?::[0-9a-f]{2}){5}', re.IGNORECASE)
+IPV4_RE = re.compile(r'\b\d{1,3}(?:\.\d{1,3}){3}\b')
+IPV6_RE = re.compile(r'[0-9a-f]{0,4}(?::[0-9a-f]{0,4}){3,}', re.IGNORECASE)
+
+
+def load_fixture(name):
+    return (pathlib.Path(__file__).parent / 'fixtures' / f'http_cgi-bin_{name}.htm').read_bytes()
+
+
+def test_diagnostics_sections_leak_no_address():
+    sections = {
+        'device_info': parsers.parse_device_info(load_fixture('about-power-box2.cgi')),
+        'modem_mac': parsers.parse_modem_mac(load_fixture('settings-local-network.cgi')),
+        'connectivity_info': parsers.parse_sophia_info(load_fixture('sophia_info.cgi')),
+    }
+    raw = repr({key: dict(value) if isinstance(value, Mapping) else value for key, value in sections.items()})
+    # The fixtures do carry client and subscriber addresses
+    assert MAC_RE.search(raw) and IPV4_RE.search(raw) and IPV6_RE.search(raw)
+
+    dump = repr(async_redact_data(sections, const.DIAGNOSTICS_REDACT))
+    assert not MAC_RE.search(dump)
+    assert not IPV4_RE.search(dump)
+    assert not IPV6_RE.search(dump)
+    # Wired clients' hostnames go too, while the link state stays readable
+    assert 'deco-X50' not in dump
+    assert 'rx_power_dbm' in dump
@@ -0,0 +1,135 @@
+import asyncio
+import pathlib
+import importlib.util
+import sys
+
+
+def _load_module(name, filename):
+    here = pathlib.Path(__file__).parent
+    spec = importlib.util.spec_from_file_location(name, str((here / filename).resolve()))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+api = _load_module('mitrastar_api', '../api.py')
+parsers = _load_module('mitrastar_parsers', '../parsers.py')
+fake_modem = _load_module('mitrastar_fake_modem', 'fake_modem.py')
+
+
+def load_fixture(name):
+    return (pathlib.Path(__file__).parent / 'fixtures' / f'http_cgi-bin_{name}.htm').read_text(
+        encoding='utf-8', errors='ignore')
+
+
+def _run(scenario, faults=None):
+    async def main():
+        async with fake_modem.FakeModem(faults=faults) as modem:
+            client = api.MitraStarClient(modem.host, modem.username, modem.password, timeout=5)
+            try:
+                return await scenario(modem, client)
+            finally:
+                await client.async_close()
+
+    return asyncio.run(main())
+
+
+def test_login_and_pages_end_to_end():
+    async def scenario(modem, client):
+        assert await client.async_login()
+        devices = await client.async_fetch('/cgi-bin/dhcp_client_list.cgi', decode=False)
+        about = await client.async_fetch_raw('/cgi-bin/about-power-box2.cgi', decode=False)
+        return modem, devices, about
+
+    modem, devices, about = _run(scenario)
+    expected = modem.pages
+    assert parsers.parse_device_table(devices) == parsers.parse_device_table(expected['/cgi-bin/dhcp_client_list.cgi'])
+    assert parsers.parse_device_info(about) == parsers.parse_device_info(expected['/cgi-bin/about-power-box2.cgi'])
+    assert modem.logins == 1
+
+
+def test_expired_session_and_wrong_password():
+    async def scenario(modem, client):
+        assert await client.async_login()
+        modem.expire_sessions()
+        try:
+            await client.async_fetch('/cgi-bin/settings-local-network.cgi')
+        except api.SessionExpired:
+            expired = True
+        else:
+            expired = False
+        client.password = 'wrong'
+        return expired, await client.async_login(), modem.failed_logins
+
+    assert _run(scenario) == (True, False, 1)
+
+
+def test_reset_and_trickled_streaming():
+    faults = fake_modem.Faults(trickle_bytes=512, trickle_delay=0.001,
+                               reset_paths={'/cgi-bin/settings-wireless-network.cgi'})
+
+    async def scenario(modem, client):
+        assert await client.async_login()
+        try:
+            await client.async_fetch('/cgi-bin/settings-wireless-network.cgi')
+        except api.CannotConnect:
+            reset = True
+        else:
+            reset = False
+        extractor = parsers.StreamExtractor(parsers.DEVICE_INFO_FIELDS)
+        await client.async_fetch_fields('/cgi-bin/about-power-box2.cgi', extractor, lenient=True)
+        return reset, extractor, len(modem.pages['/cgi-bin/about-power-box2.cgi'])
+
+    reset, extractor, page_size = _run(scenario, faults)
+    assert reset
+    assert extractor.done
+    assert extractor.received < page_size
+
+
+def test_truncated_body_is_an_error_not_a_shorter_page():
+    dhcp = '/cgi-bin/dhcp_client_list.cgi'
+    local_network = '/cgi-bin/settings-local-network.cgi'
+    faults = fake_modem.Faults(truncate_paths={dhcp, local_network})
+
+    async def scenario(modem, client):
+        assert await client.async_login()
+        outcomes = []
+        for fetch in (
+            lambda: client.async_fetch(dhcp),
+            lambda: client.async_fetch_fields(local_network, parsers.StreamExtractor(parsers.MODEM_MAC_FIELDS)),
+        ):
+            try:
+                await fetch()
+            except api.CannotConnect:
+                outcomes.append('error')
+            else:
+                outcomes.append('ok')
+        # The connection was dropped, so the next request works on a fresh one
+        modem.faults.truncate_paths.clear()
+        rows = list(parsers.iter_device_rows(await client.async_fetch(dhcp)))
+        return outcomes, rows
+
+    outcomes, rows = _run(scenario, faults)
+    assert outcomes == ['error', 'error']
+    assert len(rows) == len(list(parsers.iter_device_rows(load_fixture('dhcp_client_list.cgi'))))
+
+
+def test_cut_chunked_body_is_an_error():
+    async def read(raw):
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await api._async_read_response(reader, '/x')
+
+    head = b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n'
+    response, reusable = asyncio.run(read(head + b'5\r\nhello\r\n0\r\n\r\n'))
+    assert bytes(response.body) == b'hello' and reusable
+
+    for cut in (b'5\r\nhello\r\n', b'5\r\nhel'):
+        try:
+            asyncio.run(read(head + cut))
+        except api.CannotConnect:
+            pass
+        else:
+            raise AssertionError(f'cut chunked body accepted: {cut!r}')
@@ -0,0 +1,79 @@
+import asyncio
+import pathlib
+import importlib.util
+import sys
+
+
+def _load_fleet_module():
+    here = pathlib.Path(__file__).parent
+    module_path = (here / '..' / 'fleet.py').resolve()
+    spec = importlib.util.spec_from_file_location('mitrastar_fleet', str(module_path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['mitrastar_fleet'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_fleet_staggers_members_and_caps_requests():
+    fleet_module = _load_fleet_module()
+    fires = {}
+
+    async def main():
+        fleet = fleet_module.FleetScheduler(max_in_flight=2)
+
+        def make_refresh(key):
+            async def refresh():
+                fires.setdefault(key, []).append(asyncio.get_running_loop().time())
+                async with fleet.request_slot():
+                    await asyncio.sleep(0.05)
+                return True
+            return refresh
+
+        started = asyncio.get_running_loop().time()
+        removers = [fleet.add(f'modem-{idx}', make_refresh(f'modem-{idx}'), 0.3) for idx in range(4)]
+        await asyncio.sleep(0.9)
+        polls = fleet.polls_per_minute
+        for remove in removers:
+            remove()
+        return fleet, polls, started
+
+    fleet, polls, started = asyncio.run(main())
+    first_fires = sorted(times[0] for times in fires.values())
+    assert len(fires) == 4
+    # No member fires right away: setup has just refreshed
+    assert first_fires[0] - started > 0.02
+    # First polls are spread over the interval instead of bunched together
+    assert first_fires[-1] - first_fires[0] > 0.1
+    assert fleet.peak_in_flight <= 2
+    assert polls >= 8
+    assert len(fleet) == 0
+
+
+def test_fleet_counts_only_polls_that_did_work_and_cancels_removed_members():
+    fleet_module = _load_fleet_module()
+    cancelled = []
+
+    async def main():
+        fleet = fleet_module.FleetScheduler()
+
+        async def idle():
+            return False  # nothing due: no request reached the modem
+
+        async def stuck():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        fleet.add('idle', idle, 0.05)
+        remove_stuck = fleet.add('stuck', stuck, 0.05)
+        await asyncio.sleep(0.3)
+        polls = fleet.polls_per_minute
+        remove_stuck()
+        await asyncio.sleep(0)
+        fleet.remove('idle')
+        return polls
+
+    assert asyncio.run(main()) == 0
+    assert cancelled == [True]
@@ -0,0 +1,81 @@
+import pathlib
+import importlib.util
+import sys
+
+
+def _load_health_module():
+    here = pathlib.Path(__file__).parent
+    module_path = (here / '..' / 'health.py').resolve()
+    spec = importlib.util.spec_from_file_location('mitrastar_health', str(module_path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['mitrastar_health'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_backoff_follows_latency_and_errors():
+    health_module = _load_health_module()
+    health = health_module.ModemHealth(clock=FakeClock())
+
+    for _ in range(4):
+        health.record_response(0.1)
+    assert not health.end_cycle() and health.backoff == 1
+
+    # Slow responses stretch the interval one step per cycle, up to MAX_BACKOFF
+    for _ in range(10):
+        health.record_response(health_module.SLOW_RESPONSE + 1)
+        health.end_cycle()
+    assert health.backoff == health_module.MAX_BACKOFF
+    assert health.state == health_module.CLOSED
+
+    # Fast again: the factor shrinks back one step per healthy cycle
+    for _ in range(health_module.HEALTH_WINDOW):
+        health.record_response(0.1)
+    factors = []
+    while health.backoff > 1:
+        health.end_cycle()
+        factors.append(health.backoff)
+    assert factors == [4, 2, 1]
+
+
+def test_circuit_breaker_opens_probes_and_recovers():
+    health_module = _load_health_module()
+    clock = FakeClock()
+    health = health_module.ModemHealth(clock=clock)
+
+    for _ in range(health_module.BREAKER_FAILURES):
+        assert health.allow_request()
+        health.record_error()
+    assert health.state == health_module.OPEN
+    assert health.backoff == health_module.MAX_BACKOFF
+    assert not health.allow_request()
+
+    # After the cooldown exactly one probe goes through
+    clock.now += health_module.BREAKER_COOLDOWN
+    assert health.allow_request()
+    assert health.state == health_module.HALF_OPEN
+    assert not health.allow_request()
+
+    # Failed probe: reopened with a longer cooldown
+    health.record_error()
+    assert health.state == health_module.OPEN
+    assert health.cooldown == 2 * health_module.BREAKER_COOLDOWN
+    clock.now += health_module.BREAKER_COOLDOWN
+    assert not health.allow_request()
+    clock.now += health_module.BREAKER_COOLDOWN
+    assert health.allow_request()
+
+    # Successful probe closes the circuit; the backoff then decays cycle by cycle
+    health.record_response(0.2)
+    assert health.state == health_module.CLOSED and health.allow_request()
+    assert health.cooldown == health_module.BREAKER_COOLDOWN
+    assert health.end_cycle() and health.backoff == health_module.MAX_BACKOFF // 2
+    assert health.as_dict()['trips'] == 1
@@ -37,3 +37,143 @@ def test_parse_wifi_5ghz():
     assert data.get('ssid') is not None
     assert 'mac_address' in data
     assert data.get('operation_mode') != 'Desconhecido'
+
+
+def test_wifi_parsers_match_known_fixture_output():
+    parsers = _load_parsers_module()
+    expected_24 = {
+        'enabled': False, 'ssid': 'SEU_SSID_WIFI', 'ssid_broadcast': True, 'password': 'SUA_SENHA_WIFI',
+        'security': 'WPA2', 'wps': True, 'operation_mode': '802.11g/n', 'channel': 'Automático',
+        'bandwidth': 'Automático', 'mac_address': 'AA:BB:CC:DD:13:13', 'wmm': True, 'frequency_band': '2.4 GHz',
+    }
+    expected_5 = {
+        'enabled': False, 'ssid': 'SEU_SSID_WIFI', 'ssid_broadcast': True, 'password': 'SUA_SENHA_WIFI',
+        'security': 'WPA2', 'wps': True, 'operation_mode': '802.11n/ac', 'channel': 'Automático',
+        'bandwidth': '80 MHz', 'mac_address': 'AA:BB:CC:DD:14:14', 'wmm': True, 'frequency_band': '5 GHz',
+    }
+    assert parsers.parse_wifi_24ghz(load_sample('settings-wireless-network.cgi')) == expected_24
+    assert parsers.parse_wifi_5ghz(load_sample('settings-wireless-network-5g.cgi')) == expected_5
+
+
+def test_form_index_lookups():
+    parsers = _load_parsers_module()
+    html = """
+    <input type=radio name='WifiState' value='1' checked>
+    <input name="SSID" value="My Net">
+    <select name="select_Channel" value="6"></select>
+    <select name="securityMode"><option value="7">a</option><option selected value="4">b</option></select>
+    """
+    form = parsers.FormIndex(html)
+    assert form.is_checked('WifiState', value='1')
+    assert not form.is_checked('WifiState', value='0')
+    assert form.value('SSID5G', 'SSID') == 'My Net'
+    assert form.selected('securityMode') == '4'
+    assert form.selected('select_Channel_5G', 'select_Channel') == '6'
+
+
+def test_pattern_compile_count_stays_flat_across_refreshes():
+    parsers = _load_parsers_module()
+    pages = {name: load_sample(name) for name in (
+        'settings-wireless-network.cgi', 'settings-wireless-network-5g.cgi',
+        'about-power-box2.cgi', 'dhcp_client_list.cgi', 'settings-local-network.cgi',
+    )}
+
+    def refresh():
+        parsers.parse_wifi_24ghz(pages['settings-wireless-network.cgi'])
+        parsers.parse_wifi_5ghz(pages['settings-wireless-network-5g.cgi'])
+        parsers.parse_device_info(pages['about-power-box2.cgi'])
+        parsers.parse_device_table(pages['dhcp_client_list.cgi'])
+        parsers.parse_modem_mac(pages['settings-local-network.cgi'])
+        parsers._get_selected_value(pages['settings-wireless-network.cgi'], 'securityMode')
+
+    refresh()
+    compiled = parsers.compile_count()
+    for _ in range(3):
+        refresh()
+    assert parsers.compile_count() == compiled
+
+
+def test_parse_device_info_and_table():
+    parsers = _load_parsers_module()
+    info = parsers.parse_device_info(load_sample('about-power-box2.cgi'))
+    assert info['modelo'] == 'GPT-2741GNAC-N1'
+    assert info['gpon_serial'] == 'MSTC09D6C9A9'
+    devices = parsers.parse_device_table(load_sample('dhcp_client_list.cgi'))
+    assert len(devices) == 16
+    assert devices['AA:BB:CC:DD:05:05'] == {
+        'hostname': 'homeassistant', 'ip_address': '192.168.1.182', 'lease_time': '142 min',
+    }
+
+
+def test_stream_extractor_stops_once_device_info_fields_arrive():
+    parsers = _load_parsers_module()
+    html = load_sample('about-power-box2.cgi')
+    body = html.encode('iso-8859-1', errors='ignore')
+    extractor = parsers.StreamExtractor(parsers.DEVICE_INFO_FIELDS)
+
+    for start in range(0, len(body), 1024):
+        if extractor.feed(body[start:start + 1024]):
+            break
+
+    assert extractor.done
+    assert extractor.received < len(body)
+    assert parsers.parse_device_info(extractor.buffer) == parsers.parse_device_info(html)
+
+
+def test_stream_extractor_reads_whole_page_when_field_is_missing():
+    parsers = _load_parsers_module()
+    html = load_sample('settings-local-network.cgi')
+    extractor = parsers.StreamExtractor(parsers.MODEM_MAC_FIELDS)
+
+    assert not extractor.feed(html.encode('iso-8859-1', errors='ignore'))
+    assert extractor.finish() == {}
+    assert parsers.parse_modem_mac(extractor.buffer) == parsers.parse_modem_mac(html)
+
+
+def test_parsers_give_identical_results_on_raw_bytes():
+    parsers = _load_parsers_module()
+    cases = [
+        (parsers.parse_wifi_24ghz, 'settings-wireless-network.cgi'),
+        (parsers.parse_wifi_5ghz, 'settings-wireless-network-5g.cgi'),
+        (parsers.parse_device_info, 'about-power-box2.cgi'),
+        (parsers.parse_device_table, 'dhcp_client_list.cgi'),
+        (parsers.parse_modem_mac, 'settings-local-network.cgi'),
+    ]
+    for parse, name in cases:
+        html = load_sample(name)
+        raw = html.encode('iso-8859-1', errors='ignore')
+        expected = parse(html)
+        assert parse(raw) == expected, name
+        assert parse(memoryview(bytearray(raw))) == expected, name
+
+
+def test_sophia_info_parses_sections_on_demand():
+    parsers = _load_parsers_module()
+    html = load_sample('sophia_info.cgi')
+    info = parsers.parse_sophia_info(html.encode('iso-8859-1', errors='ignore'))
+
+    assert list(info) == ['gpon', 'internet', 'wlan_24ghz', 'wlan_5ghz', 'lan', 'tv', 'voip']
+    assert info.parsed == ()
+    assert 'gpon' in info and info.parsed == ()
+
+    assert info['gpon'] == {'link': 'Estabelecido', 'rx_power_dbm': -22.37, 'tx_power_dbm': 2.77}
+    assert info.parsed == ('gpon',)
+    assert info['gpon'] is info['gpon']
+
+    internet = info['internet']
+    assert internet['ppp'] == 'Conectado'
+    assert internet['ipv4_public'] == '203.0.113.100'
+    assert internet['ipv6_prefix'] == '2804:1b3:a980:9dd9::/48'
+    assert info['voip'] == {
+        'network': 'Disponível',
+        'phone': 'Não Registrado',
+        'details': ['Endereco IP de VoIP: 10.166.222.111'],
+    }
+    assert info['wlan_24ghz']['channel'] == '11'
+    assert info['tv']['status'] == 'Indisponível'
+
+    # Same result from a str page; equality compares pages without parsing them
+    assert parsers.parse_sophia_info(html).as_dict() == info.as_dict()
+    other = parsers.parse_sophia_info(html.encode('iso-8859-1', errors='ignore'))
+    assert other == info and other.parsed == ()
+    assert parsers.parse_sophia_info('') is None
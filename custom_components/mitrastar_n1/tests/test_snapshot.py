@@ -0,0 +1,45 @@
+import json
+import pathlib
+import importlib.util
+import sys
+
+
+def _load_module(name):
+    here = pathlib.Path(__file__).parent
+    module_path = (here / '..' / f'{name}.py').resolve()
+    spec = importlib.util.spec_from_file_location(f'mitrastar_{name}', str(module_path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[f'mitrastar_{name}'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_snapshot_round_trip_restores_client_records():
+    snapshot = _load_module('snapshot')
+    clients = _load_module('clients')
+    parsers = _load_module('parsers')
+    devices, _ = clients.build_devices([('AA:BB:CC:DD:EE:01', 'phone', '192.168.1.10', '60 min')])
+    data = {
+        'device_info': {'model': 'GPT-2741GNAC-N1'},
+        'devices': devices,
+        'wifi_5ghz': None,
+        # Lazy views are left out instead of being parsed for the snapshot
+        'connectivity_info': parsers.parse_sophia_info(b'<table id="status"></table>'),
+    }
+
+    payload = json.loads(json.dumps(snapshot.encode_snapshot(data, now=1000.0)))
+    sections, rows = snapshot.decode_snapshot(payload, now=1060.0)
+    restored, diff = clients.build_devices(rows)
+
+    assert sections == {'device_info': {'model': 'GPT-2741GNAC-N1'}}
+    assert dict(restored) == dict(devices)
+    assert diff.added == {'AA:BB:CC:DD:EE:01'}
+
+
+def test_snapshot_rejects_stale_or_foreign_payloads():
+    snapshot = _load_module('snapshot')
+    payload = snapshot.encode_snapshot({'modem_mac': 'AA:BB:CC:DD:EE:FF'}, now=0.0)
+
+    assert snapshot.decode_snapshot(payload, now=snapshot.SNAPSHOT_MAX_AGE + 1) is None
+    assert snapshot.decode_snapshot(dict(payload, version=0), now=1.0) is None
+    assert snapshot.decode_snapshot(None) is None
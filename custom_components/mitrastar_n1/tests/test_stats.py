@@ -0,0 +1,42 @@
+import pathlib
+import importlib.util
+import sys
+
+
+def _load_stats_module():
+    here = pathlib.Path(__file__).parent
+    module_path = (here / '..' / 'stats.py').resolve()
+    spec = importlib.util.spec_from_file_location('mitrastar_stats', str(module_path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['mitrastar_stats'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_rolling_percentiles_over_window():
+    stats = _load_stats_module()
+    rolling = stats.RollingStats(window=10)
+    for value in range(1, 21):
+        rolling.add(value / 1000)
+
+    summary = rolling.summary()
+    assert summary == {'count': 20, 'last': 20.0, 'p50': 15.0, 'p95': 20.0, 'max': 20.0}
+    assert stats.percentile([], 50) is None
+
+
+def test_refresh_stats_summary_per_page():
+    stats = _load_stats_module()
+    refresh = stats.RefreshStats()
+    refresh.record_login(0.2, relogin=True)
+    refresh.record_fetch('devices', 0.05, 2376)
+    refresh.record_parse('devices', 0.0001)
+    refresh.record_failure('devices: CannotConnect')
+
+    summary = refresh.as_dict()
+    assert summary['login_ms']['p95'] == 200.0
+    assert summary['relogins'] == 1
+    assert summary['fetch_ms']['devices']['p50'] == 50.0
+    assert summary['page_bytes'] == {'devices': 2376}
+    assert summary['parse_ms']['devices']['last'] == 0.1
+    assert summary['failures'] == {'devices: CannotConnect': 1}
+    assert summary['cycle_ms']['p50'] is None
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Benchmark dos parsers sobre as fixtures reais (e variantes ampliadas).
+
+Mede tempo por chamada, vazão (MB/s) e pico de memória (tracemalloc) de cada
+parser. A primeira execução grava um baseline; as seguintes comparam com ele e
+falham (exit code 1) se a vazão de algum caso cair mais que o limite.
+
+Os casos ``refresh_str`` e ``refresh_bytes`` simulam um ciclo completo sobre os
+bytes crus das cinco páginas: decodificando cada uma para str antes do parse
+(caminho antigo) ou interpretando os bytes diretamente (caminho atual).
+
+Uso:
+    python scripts/benchmark_parsers.py                  # compara com o baseline
+    python scripts/benchmark_parsers.py --update-baseline
+    python scripts/benchmark_parsers.py --threshold 0.15 --baseline /tmp/base.json
+"""
+import argparse
+import importlib.util
+import json
+import sys
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+COMPONENT_DIR = ROOT / "custom_components" / "mitrastar_n1"
+FIXTURES_DIR = COMPONENT_DIR / "tests" / "fixtures"
+DEFAULT_BASELINE = ROOT / ".benchmarks" / "parsers.json"
+DEFAULT_THRESHOLD = 0.25
+
+# Fatores de ampliação das variantes sintéticas
+ENLARGE_FACTOR = 4
+SYNTHETIC_CLIENTS = 256
+
+
+def load_parsers():
+    spec = importlib.util.spec_from_file_location("mitrastar_parsers", COMPONENT_DIR / "parsers.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["mitrastar_parsers"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_fixture(name):
+    return (FIXTURES_DIR / f"http_cgi-bin_{name}.htm").read_text(encoding="utf-8", errors="ignore")
+
+
+def synthetic_dhcp_list(clients):
+    """Lista DHCP com ``clients`` linhas e MACs únicos."""
+    rows = []
+    for idx in range(clients):
+        mac = ":".join(f"{b:02X}" for b in (0xAA, 0xBB, idx >> 8, idx & 0xFF, 0x00, 0x01))
+        rows.append(
+            f'<tr><td class="cinza">host-{idx}</td><td class="center">{mac}</td>'
+            f'<td class="center">192.168.{idx >> 8}.{idx & 0xFF}</td><td class="center">{idx % 240} min</td></tr>'
+        )
+    return "\n".join(rows)
+
+
+def refresh_functions(parsers):
+    """Ciclo completo (str x bytes) sobre [(parser, bytes crus)]."""
+    def refresh_str(pages):
+        return [parse(raw.decode("iso-8859-1", errors="ignore")) for parse, raw in pages]
+
+    def refresh_bytes(pages):
+        return [parse(raw) for parse, raw in pages]
+
+    return refresh_str, refresh_bytes
+
+
+def payload_size(payload):
+    if isinstance(payload, str):
+        return len(payload.encode("iso-8859-1", errors="ignore"))
+    if isinstance(payload, list):
+        return sum(len(raw) for _, raw in payload)
+    return len(payload)
+
+
+def build_cases(parsers):
+    """Retorna [(nome, função, html)]."""
+    wifi_24 = load_fixture("settings-wireless-network.cgi")
+    wifi_5 = load_fixture("settings-wireless-network-5g.cgi")
+    about = load_fixture("about-power-box2.cgi")
+    dhcp = load_fixture("dhcp_client_list.cgi")
+    local = load_fixture("settings-local-network.cgi")
+    refresh_str, refresh_bytes = refresh_functions(parsers)
+    pages = [
+        (parsers.parse_wifi_24ghz, wifi_24),
+        (parsers.parse_wifi_5ghz, wifi_5),
+        (parsers.parse_device_info, about),
+        (parsers.parse_device_table, dhcp),
+        (parsers.parse_modem_mac, local),
+    ]
+    raw_pages = [(parse, html.encode("iso-8859-1", errors="ignore")) for parse, html in pages]
+    return [
+        ("wifi_24ghz", parsers.parse_wifi_24ghz, wifi_24),
+        ("wifi_5ghz", parsers.parse_wifi_5ghz, wifi_5),
+        ("device_info", parsers.parse_device_info, about),
+        ("device_table", parsers.parse_device_table, dhcp),
+        ("modem_mac", parsers.parse_modem_mac, local),
+        (f"wifi_24ghz_x{ENLARGE_FACTOR}", parsers.parse_wifi_24ghz, wifi_24 * ENLARGE_FACTOR),
+        (f"wifi_5ghz_x{ENLARGE_FACTOR}", parsers.parse_wifi_5ghz, wifi_5 * ENLARGE_FACTOR),
+        (f"device_info_x{ENLARGE_FACTOR}", parsers.parse_device_info, about * ENLARGE_FACTOR),
+        (f"device_table_{SYNTHETIC_CLIENTS}_clients", parsers.parse_device_table, synthetic_dhcp_list(SYNTHETIC_CLIENTS)),
+        (f"modem_mac_x{ENLARGE_FACTOR}", parsers.parse_modem_mac, local * ENLARGE_FACTOR),
+        ("refresh_str", refresh_str, raw_pages),
+        ("refresh_bytes", refresh_bytes, raw_pages),
+    ]
+
+
+def measure(func, html, repeat):
+    """Melhor tempo por chamada (s) e pico de memória alocada (bytes)."""
+    func(html)  # aquece caches (padrões compilados etc.)
+    timer = timeit.Timer(lambda: func(html))
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    tracemalloc.start()
+    func(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def run(repeat):
+    parsers = load_parsers()
+    results = {}
+    for name, func, html in build_cases(parsers):
+        seconds, peak = measure(func, html, repeat)
+        size = payload_size(html)
+        results[name] = {
+            "bytes": size,
+            "ms_per_call": round(seconds * 1000, 4),
+            "mb_per_s": round(size / seconds / 1e6, 3),
+            "peak_kib": round(peak / 1024, 1),
+        }
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Retorna a lista de casos cuja vazão caiu mais que ``threshold``."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        floor = previous["mb_per_s"] * (1 - threshold)
+        if current["mb_per_s"] < floor:
+            regressions.append((name, previous["mb_per_s"], current["mb_per_s"]))
+    return regressions
+
+
+def print_report(results, baseline):
+    print(f"{'caso':32} {'KiB':>8} {'ms/chamada':>11} {'MB/s':>9} {'pico KiB':>9} {'vs base':>8}")
+    for name, r in results.items():
+        delta = ""
+        if name in baseline:
+            delta = f"{r['mb_per_s'] / baseline[name]['mb_per_s'] - 1:+.0%}"
+        print(f"{name:32} {r['bytes'] / 1024:8.1f} {r['ms_per_call']:11.3f} {r['mb_per_s']:9.2f} {r['peak_kib']:9.1f} {delta:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="arquivo JSON do baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="queda de vazão tolerada (fração, padrão 0.25)")
+    parser.add_argument("--repeat", type=int, default=5, help="repetições por caso")
+    parser.add_argument("--update-baseline", action="store_true", help="regrava o baseline com esta execução")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text()).get("results", {})
+    print_report(results, baseline)
+
+    if not baseline or args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(
+            {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0], "results": results},
+            indent=2,
+        ))
+        print(f"\nBaseline gravado em {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nRegressão de vazão acima de {args.threshold:.0%}:")
+        for name, before, after in regressions:
+            print(f"  {name}: {before:.2f} -> {after:.2f} MB/s")
+        return 1
+    print(f"\nSem regressões acima de {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
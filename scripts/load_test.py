@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Teste de carga: N coordinators contra modems falsos locais.
+
+Cria N ``MitraStarCoordinator`` (com um ``hass`` mínimo, sem o Home Assistant)
+apontando para servidores de ``tests/fake_modem.py`` e roda ``--rounds`` rodadas
+em que todos atualizam ao mesmo tempo (pior caso: as instâncias acordam juntas),
+passando pelo limite global de requisições da frota. Informa atualizações por
+segundo, latência do ciclo (p50/p95/p99), threads e uso do executor, e pico de
+RSS. Com a mesma semente e parâmetros o resultado é comparável entre execuções.
+
+Uso:
+    python scripts/load_test.py --modems 200 --rounds 5
+    python scripts/load_test.py --modems 300 --latency 0.05 --json /tmp/run.json
+    python scripts/load_test.py --modems 300 --compare /tmp/run.json
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import random
+import resource
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from custom_components import mitrastar_n1  # noqa: E402
+from custom_components.mitrastar_n1.fleet import FleetScheduler  # noqa: E402
+from custom_components.mitrastar_n1.stats import percentile  # noqa: E402
+
+FAKE_MODEM_PATH = ROOT / "custom_components" / "mitrastar_n1" / "tests" / "fake_modem.py"
+
+
+def load_fake_modem():
+    spec = importlib.util.spec_from_file_location("mitrastar_fake_modem", FAKE_MODEM_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["mitrastar_fake_modem"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class MinimalHass:
+    """O mínimo de ``hass`` que o coordinator usa, contando o uso do executor."""
+
+    def __init__(self):
+        self.data = {}
+        self.loop = asyncio.get_running_loop()
+        self.executor_jobs = 0
+
+    async def async_add_executor_job(self, target, *args):
+        self.executor_jobs += 1
+        return await self.loop.run_in_executor(None, target, *args)
+
+
+def raise_fd_limit():
+    """Sobe o limite de arquivos abertos até o máximo permitido (N modems = muitos sockets)."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def run(args):
+    random.seed(args.seed)
+    fake_modem = load_fake_modem()
+    faults = fake_modem.Faults(latency=args.latency)
+    pages = fake_modem.load_pages()
+    servers = [
+        await fake_modem.FakeModem(faults=faults, pages=pages).start()
+        for _ in range(min(args.servers, args.modems))
+    ]
+    hass = MinimalHass()
+    fleet = FleetScheduler(max_in_flight=args.max_in_flight)
+    coordinators = [
+        mitrastar_n1.MitraStarCoordinator(
+            hass, servers[idx % len(servers)].host, "admin", "secret", fleet=fleet,
+        )
+        for idx in range(args.modems)
+    ]
+
+    latencies = []
+    failures = 0
+    peak_threads = threading.active_count()
+
+    async def refresh(coordinator):
+        nonlocal failures, peak_threads
+        if args.full:
+            # Todas as páginas vencidas e sem digest: o ciclo mais caro possível
+            coordinator._next_fetch = dict.fromkeys(coordinator._next_fetch, 0.0)
+            coordinator._digests.clear()
+        else:
+            # Adianta a agenda em um intervalo de polling, como se ele tivesse passado
+            step = coordinator.poll_interval.total_seconds()
+            coordinator._next_fetch = {key: due - step for key, due in coordinator._next_fetch.items()}
+        started = time.perf_counter()
+        await coordinator.async_refresh()
+        latencies.append(time.perf_counter() - started)
+        failures += not coordinator.last_update_success
+        peak_threads = max(peak_threads, threading.active_count())
+
+    try:
+        # Rodada de aquecimento: logins e conexões keep-alive
+        await asyncio.gather(*(refresh(c) for c in coordinators))
+        latencies.clear()
+        failures = 0
+
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            await asyncio.gather(*(refresh(c) for c in coordinators))
+        elapsed = time.perf_counter() - started
+    finally:
+        for coordinator in coordinators:
+            await coordinator.client.async_close()
+        for server in servers:
+            await server.stop()
+
+    return {
+        "config": {key: getattr(args, key) for key in
+                   ("modems", "rounds", "servers", "max_in_flight", "latency", "full", "seed")},
+        "results": {
+            "refreshes": len(latencies),
+            "failures": failures,
+            "refreshes_per_s": round(len(latencies) / elapsed, 1),
+            "cycle_p50_ms": round(percentile(latencies, 50) * 1000, 1),
+            "cycle_p95_ms": round(percentile(latencies, 95) * 1000, 1),
+            "cycle_p99_ms": round(percentile(latencies, 99) * 1000, 1),
+            "peak_in_flight": fleet.peak_in_flight,
+            "peak_threads": peak_threads,
+            "executor_jobs": hass.executor_jobs,
+            # ru_maxrss vem em KiB no Linux
+            "peak_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            "python": sys.version.split()[0],
+        },
+    }
+
+
+def print_report(report, previous=None):
+    print("configuração:", ", ".join(f"{k}={v}" for k, v in report["config"].items()))
+    for key, value in report["results"].items():
+        delta = ""
+        if previous and isinstance(value, (int, float)) and previous.get(key):
+            delta = f"  ({value / previous[key] - 1:+.0%} vs anterior)"
+        print(f"  {key:18} {value}{delta}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modems", type=int, default=100, help="coordinators simulados")
+    parser.add_argument("--rounds", type=int, default=5, help="rodadas medidas (após o aquecimento)")
+    parser.add_argument("--servers", type=int, default=32, help="servidores falsos compartilhados pelos modems")
+    parser.add_argument("--max-in-flight", type=int, default=FleetScheduler().max_in_flight,
+                        help="limite global de requisições simultâneas")
+    parser.add_argument("--latency", type=float, default=0.0, help="latência injetada por resposta (s)")
+    parser.add_argument("--tiered", dest="full", action="store_false",
+                        help="cada rodada vale um intervalo de polling: só as páginas vencidas são buscadas")
+    parser.add_argument("--seed", type=int, default=0, help="semente do jitter")
+    parser.add_argument("--json", type=Path, help="grava o resultado neste arquivo")
+    parser.add_argument("--compare", type=Path, help="resultado anterior (JSON) para comparar")
+    args = parser.parse_args()
+
+    raise_fd_limit()
+    report = asyncio.run(run(args))
+    previous = json.loads(args.compare.read_text())["results"] if args.compare else None
+    print_report(report, previous)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())